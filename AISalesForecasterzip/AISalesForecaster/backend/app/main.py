@@ -1,39 +1,72 @@
 import os
+import queue
 import logging
-from fastapi import FastAPI
+import logging.handlers
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
-from .models.database import init_database
+from .models.database import init_database, close_pool
+from .services.chat_service import ChatService
+from .utils.charts import shutdown_chart_pool
 from .routes import upload_router, forecast_router, insights_router, download_router, delete_router, recommendations_router, chat_router
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Records are handed to a queue on the calling thread; a background listener
+# does the timestamp formatting and the stderr write off the event loop
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
+# The frontend reaches the API through a same-origin /api proxy, so CORS only
+# matters for direct cross-origin clients; list them explicitly in CORS_ORIGINS
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "http://localhost:5000,http://127.0.0.1:5000").split(",")
+    if origin.strip()
+]
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    _log_listener.start()
     logger.info("Starting AI Sales Forecaster API...")
     init_database()
     logger.info("Database initialized")
+    app.state.chat_service = ChatService()
     yield
     logger.info("Shutting down AI Sales Forecaster API...")
+    app.state.chat_service.close()
+    await app.state.chat_service.aclose()
+    close_pool()
+    shutdown_chart_pool()
+    _log_listener.stop()
 
 
 app = FastAPI(
     title="AI Sales Forecaster & Business Insight Generator",
     description="Production-capable API for sales forecasting using Prophet and LightGBM models",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Forecast series and insights are repetitive numeric JSON that gzip shrinks
+# several-fold; level 4 keeps the CPU cost per response small
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -47,21 +80,26 @@ app.include_router(recommendations_router, prefix="/api", tags=["AI Features"])
 app.include_router(chat_router, prefix="/api", tags=["Chat"])
 
 
+# Static bodies for the root and health endpoints are encoded once at import
+_ROOT_BYTES = orjson.dumps({
+    "name": "AI Sales Forecaster & Business Insight Generator",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "upload": "/api/upload",
+        "forecast": "/api/forecast",
+        "insights": "/api/insights",
+        "download": "/api/download"
+    }
+})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy"})
+
+
 @app.get("/")
 async def root():
-    return {
-        "name": "AI Sales Forecaster & Business Insight Generator",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "upload": "/api/upload",
-            "forecast": "/api/forecast",
-            "insights": "/api/insights",
-            "download": "/api/download"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
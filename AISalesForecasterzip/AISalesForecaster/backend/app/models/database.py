@@ -1,228 +1,527 @@
 import sqlite3
-import json
 import os
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple, Union
 from contextlib import contextmanager
 
+import orjson
+import zstandard
+import pyarrow as pa
+
 DATABASE_PATH = os.environ.get("DATABASE_PATH", "backend/data/forecaster.db")
+DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", min(32, (os.cpu_count() or 1) * 4)))
+
+_STATEMENT_CACHE_SIZE = 256
+# JSON blobs at least this large are stored zstd-compressed; smaller ones stay plain
+_COMPRESS_MIN_BYTES = 1024
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+# Forecast/historical series are stored as Arrow IPC streams, which open with this marker
+_ARROW_STREAM_MAGIC = b'\xff\xff\xff\xff'
+_ARROW_WRITE_OPTIONS = pa.ipc.IpcWriteOptions(compression='zstd')
+_codecs = threading.local()
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DATABASE_POOL_SIZE)
+
+_JOB_COLUMNS = (
+    'job_id', 'created_at', 'updated_at', 'status', 'file_path', 'original_filename',
+    'row_count', 'column_count', 'columns', 'date_range', 'validation_result'
+)
+_FORECAST_COLUMNS = (
+    'id', 'job_id', 'created_at', 'model_type', 'aggregation', 'horizon', 'target_column',
+    'group_by', 'metrics', 'forecast_data', 'historical_data', 'decomposition_data',
+    'feature_importance', 'top_products', 'top_regions'
+)
+_INSIGHTS_COLUMNS = (
+    'id', 'job_id', 'created_at', 'title', 'summary', 'kpis', 'bullets', 'recommendations'
+)
+
+# Statement text is shared across calls so each pooled connection's
+# statement cache re-uses the compiled statement instead of re-preparing it.
+_SQL_INSERT_JOB = """
+    INSERT INTO jobs (job_id, created_at, updated_at, status, file_path,
+                      original_filename, row_count, column_count, columns,
+                      date_range, validation_result)
+    VALUES (?, ?, ?, 'uploaded', ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_SELECT_JOB = "SELECT * FROM jobs WHERE job_id = ?"
+_SQL_UPDATE_JOB_STATUS = "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?"
+_SQL_DELETE_JOB = "DELETE FROM jobs WHERE job_id = ?"
+_SQL_INSERT_FORECAST = """
+    INSERT INTO forecasts (job_id, created_at, model_type, aggregation,
+                           horizon, target_column, group_by, metrics,
+                           forecast_data, historical_data, decomposition_data,
+                           feature_importance, top_products, top_regions,
+                           response_cache)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_FORECAST_POINT = """
+    INSERT INTO forecast_points (forecast_id, kind, date, actual, predicted, lower_bound, upper_bound)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_SELECT_LATEST_FORECAST = f"""
+    SELECT {', '.join(_FORECAST_COLUMNS)}
+    FROM forecasts WHERE job_id = ? ORDER BY created_at DESC LIMIT 1
+"""
+_SQL_SELECT_LATEST_FORECAST_VERSION = """
+    SELECT id, created_at FROM forecasts WHERE job_id = ? ORDER BY created_at DESC LIMIT 1
+"""
+_SQL_SELECT_FORECAST_SERIES = """
+    SELECT id, created_at, forecast_data, historical_data, feature_importance
+    FROM forecasts WHERE id = ?
+"""
+_SQL_SELECT_LATEST_FORECAST_RESPONSE = """
+    SELECT response_cache FROM forecasts WHERE job_id = ? ORDER BY created_at DESC LIMIT 1
+"""
+_SQL_INSERT_INSIGHTS = """
+    INSERT INTO insights (job_id, created_at, title, summary, kpis, bullets, recommendations)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_SELECT_LATEST_INSIGHTS = "SELECT * FROM insights WHERE job_id = ? ORDER BY created_at DESC LIMIT 1"
+# Job plus its latest forecast and insights in one statement; columns are
+# prefixed f_/i_ so the three rows can be split apart again
+_SQL_SELECT_JOB_WITH_FORECAST = f"""
+    SELECT {', '.join(f'j.{c}' for c in _JOB_COLUMNS)},
+           {', '.join(f'f.{c} AS f_{c}' for c in _FORECAST_COLUMNS)},
+           {', '.join(f'i.{c} AS i_{c}' for c in _INSIGHTS_COLUMNS)}
+    FROM jobs j
+    LEFT JOIN forecasts f ON f.id = (
+        SELECT id FROM forecasts WHERE job_id = j.job_id ORDER BY created_at DESC LIMIT 1
+    )
+    LEFT JOIN insights i ON i.id = (
+        SELECT id FROM insights WHERE job_id = j.job_id ORDER BY created_at DESC LIMIT 1
+    )
+    WHERE j.job_id = ?
+"""
+_SQL_SELECT_RECENT_JOBS = """
+    SELECT j.job_id, j.created_at, j.original_filename, j.row_count,
+           j.column_count, j.status,
+           f.model_type, f.aggregation, f.horizon, f.target_column,
+           f.created_at as forecast_created_at
+    FROM jobs j
+    LEFT JOIN (
+        SELECT job_id, model_type, aggregation, horizon, target_column, created_at,
+               ROW_NUMBER() OVER (PARTITION BY job_id ORDER BY created_at DESC) as rn
+        FROM forecasts
+    ) f ON j.job_id = f.job_id AND f.rn = 1
+    ORDER BY j.created_at DESC
+    LIMIT ?
+"""
+
+
+_SCHEMA = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    file_path TEXT,
+    original_filename TEXT,
+    row_count INTEGER,
+    column_count INTEGER,
+    columns BLOB,
+    date_range BLOB,
+    validation_result BLOB
+);
+
+CREATE TABLE IF NOT EXISTS forecasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    model_type TEXT,
+    aggregation TEXT,
+    horizon INTEGER,
+    target_column TEXT,
+    group_by TEXT,
+    metrics BLOB,
+    forecast_data BLOB,
+    historical_data BLOB,
+    decomposition_data BLOB,
+    feature_importance BLOB,
+    top_products BLOB,
+    top_regions BLOB,
+    response_cache BLOB,
+    FOREIGN KEY (job_id) REFERENCES jobs(job_id)
+);
+
+CREATE TABLE IF NOT EXISTS insights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    title TEXT,
+    summary TEXT,
+    kpis BLOB,
+    bullets BLOB,
+    recommendations BLOB,
+    FOREIGN KEY (job_id) REFERENCES jobs(job_id)
+);
+
+-- One row per forecast/historical point so series can be queried without
+-- decoding the forecast_data/historical_data blobs
+CREATE TABLE IF NOT EXISTS forecast_points (
+    forecast_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    date TEXT NOT NULL,
+    actual REAL,
+    predicted REAL,
+    lower_bound REAL,
+    upper_bound REAL,
+    FOREIGN KEY (forecast_id) REFERENCES forecasts(id)
+);
+
+-- Deleting a job removes its forecasts, insights and points in the same statement
+CREATE TRIGGER IF NOT EXISTS trg_jobs_delete_children
+BEFORE DELETE ON jobs
+BEGIN
+    DELETE FROM forecasts WHERE job_id = OLD.job_id;
+    DELETE FROM insights WHERE job_id = OLD.job_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_forecasts_delete_points
+BEFORE DELETE ON forecasts
+BEGIN
+    DELETE FROM forecast_points WHERE forecast_id = OLD.id;
+END;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_forecasts_job_created ON forecasts(job_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_insights_job_created ON insights(job_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_forecast_points_forecast ON forecast_points(forecast_id, kind);
+
+COMMIT;
+"""
 
 
 def init_database():
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
     
     with get_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                job_id TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                file_path TEXT,
-                original_filename TEXT,
-                row_count INTEGER,
-                column_count INTEGER,
-                columns TEXT,
-                date_range TEXT,
-                validation_result TEXT
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS forecasts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                model_type TEXT,
-                aggregation TEXT,
-                horizon INTEGER,
-                target_column TEXT,
-                group_by TEXT,
-                metrics TEXT,
-                forecast_data TEXT,
-                historical_data TEXT,
-                decomposition_data TEXT,
-                feature_importance TEXT,
-                top_products TEXT,
-                top_regions TEXT,
-                FOREIGN KEY (job_id) REFERENCES jobs(job_id)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS insights (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                title TEXT,
-                summary TEXT,
-                kpis TEXT,
-                bullets TEXT,
-                recommendations TEXT,
-                FOREIGN KEY (job_id) REFERENCES jobs(job_id)
-            )
-        """)
+        # WAL is persisted in the database file, so it only needs setting once
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
         
+        cursor = conn.cursor()
+        _add_column_if_missing(cursor, 'forecasts', 'response_cache', 'BLOB')
         conn.commit()
+        cursor.execute("ANALYZE")
+
+
+def _add_column_if_missing(cursor: sqlite3.Cursor, table: str, column: str, column_type: str) -> None:
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row['name'] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def _create_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False,
+                           cached_statements=_STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    # Per-connection tuning: WAL makes synchronous=NORMAL safe, and reads are
+    # served from the memory map and a 128 MB page cache
+    conn.executescript("""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-131072;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA wal_autocheckpoint=1000;
+    """)
+    return conn
 
 
 @contextmanager
 def get_connection():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """Borrow a pooled connection, opening a new one only when the pool is empty"""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _create_connection()
     try:
         yield conn
     finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def _zstd() -> Tuple[zstandard.ZstdCompressor, zstandard.ZstdDecompressor]:
+    # zstandard contexts are not thread-safe, so each worker thread keeps its own pair
+    if not hasattr(_codecs, 'compressor'):
+        _codecs.compressor = zstandard.ZstdCompressor(level=3)
+        _codecs.decompressor = zstandard.ZstdDecompressor()
+    return _codecs.compressor, _codecs.decompressor
+
+
+def _decompress(value: Union[bytes, str]) -> Union[bytes, str]:
+    if isinstance(value, bytes) and value.startswith(_ZSTD_MAGIC):
+        return _zstd()[1].decompress(value)
+    return value
+
+
+@contextmanager
+def transaction():
+    """Run several write helpers on one connection inside a single BEGIN IMMEDIATE ... COMMIT"""
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+
+
+@contextmanager
+def _writer(conn: Optional[sqlite3.Connection]):
+    # Writes join the caller's transaction when given one, otherwise commit on their own
+    if conn is not None:
+        yield conn
+    else:
+        with transaction() as own:
+            yield own
+
+
+def utcnow() -> str:
+    """Timestamp in the stored format: naive UTC ISO text with microseconds, which sorts as text"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a JSON column once into compact bytes stored as a BLOB"""
+    data = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        return _zstd()[0].compress(data)
+    return data
+
+
+def _loads(value: Optional[Union[bytes, str]], default: Any = None) -> Any:
+    """Decode a JSON column; legacy rows written as TEXT decode the same way"""
+    return orjson.loads(_decompress(value)) if value else default
+
+
+def _dumps_series(records: List[Dict]) -> bytes:
+    """Serialize a list of series points as a zstd-compressed Arrow IPC stream"""
+    table = pa.Table.from_pylist(records)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=_ARROW_WRITE_OPTIONS) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _load_series_table(value: Optional[Union[bytes, str]]) -> pa.Table:
+    if isinstance(value, bytes) and value.startswith(_ARROW_STREAM_MAGIC):
+        return pa.ipc.open_stream(value).read_all()
+    # Rows written before Arrow storage hold JSON
+    return pa.Table.from_pylist(_loads(value, []))
+
+
+def _loads_series(value: Optional[Union[bytes, str]]) -> List[Dict]:
+    if isinstance(value, bytes) and value.startswith(_ARROW_STREAM_MAGIC):
+        return pa.ipc.open_stream(value).read_all().to_pylist()
+    return _loads(value, [])
+
+
+def _decode_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    job['columns'] = _loads(job['columns'], [])
+    job['date_range'] = _loads(job['date_range'], {})
+    job['validation_result'] = _loads(job['validation_result'], {})
+    return job
+
+
+def _decode_forecast(forecast: Dict[str, Any]) -> Dict[str, Any]:
+    forecast['metrics'] = _loads(forecast['metrics'], {})
+    forecast['forecast_data'] = _loads_series(forecast['forecast_data'])
+    forecast['historical_data'] = _loads_series(forecast['historical_data'])
+    forecast['decomposition_data'] = _loads(forecast['decomposition_data'])
+    forecast['feature_importance'] = _loads(forecast['feature_importance'])
+    forecast['top_products'] = _loads(forecast['top_products'])
+    forecast['top_regions'] = _loads(forecast['top_regions'])
+    return forecast
+
+
+def _decode_insights(insights: Dict[str, Any]) -> Dict[str, Any]:
+    insights['kpis'] = _loads(insights['kpis'], [])
+    insights['bullets'] = _loads(insights['bullets'], [])
+    insights['recommendations'] = _loads(insights['recommendations'], [])
+    return insights
+
+
+def close_pool() -> None:
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
         conn.close()
 
 
 def create_job(job_id: str, file_path: str, original_filename: str, 
                row_count: int, column_count: int, columns: List[str],
-               date_range: Dict, validation_result: Dict) -> None:
-    now = datetime.utcnow().isoformat()
+               date_range: Dict, validation_result: Dict,
+               now: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> None:
+    now = now or utcnow()
     
-    with get_connection() as conn:
+    with _writer(conn) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO jobs (job_id, created_at, updated_at, status, file_path,
-                            original_filename, row_count, column_count, columns,
-                            date_range, validation_result)
-            VALUES (?, ?, ?, 'uploaded', ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(_SQL_INSERT_JOB, (
             job_id, now, now, file_path, original_filename,
-            row_count, column_count, json.dumps(columns),
-            json.dumps(date_range), json.dumps(validation_result)
+            row_count, column_count, _dumps(columns),
+            _dumps(date_range), _dumps(validation_result)
         ))
-        conn.commit()
 
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        cursor.execute(_SQL_SELECT_JOB, (job_id,))
         row = cursor.fetchone()
         
-        if row:
-            job = dict(row)
-            job['columns'] = json.loads(job['columns']) if job['columns'] else []
-            job['date_range'] = json.loads(job['date_range']) if job['date_range'] else {}
-            job['validation_result'] = json.loads(job['validation_result']) if job['validation_result'] else {}
-            return job
-        return None
+        return _decode_job(dict(row)) if row else None
 
 
-def update_job_status(job_id: str, status: str) -> None:
-    now = datetime.utcnow().isoformat()
+def update_job_status(job_id: str, status: str,
+                      now: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> None:
+    now = now or utcnow()
     
+    with _writer(conn) as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_UPDATE_JOB_STATUS, (status, now, job_id))
+
+
+def delete_job(job_id: str) -> bool:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?
-        """, (status, now, job_id))
+        cursor.execute(_SQL_DELETE_JOB, (job_id,))
         conn.commit()
+        return cursor.rowcount > 0
 
 
 def save_forecast(job_id: str, model_type: str, aggregation: str, 
                   horizon: int, target_column: str, group_by: Optional[str],
                   metrics: Dict, forecast_data: List, historical_data: List,
                   decomposition_data: Optional[Dict], feature_importance: Optional[List],
-                  top_products: Optional[List], top_regions: Optional[List]) -> int:
-    now = datetime.utcnow().isoformat()
+                  top_products: Optional[List], top_regions: Optional[List],
+                  now: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    now = now or utcnow()
     
-    with get_connection() as conn:
+    # The GET /forecast/{job_id} body never changes once written, so it is
+    # serialized here once and served as-is by get_latest_forecast_response
+    response = {
+        'job_id': job_id,
+        'model_type': model_type,
+        'aggregation': aggregation,
+        'horizon': horizon,
+        'target_column': target_column,
+        'metrics': metrics,
+        'forecast': forecast_data,
+        'historical': historical_data,
+        'decomposition': decomposition_data or None,
+        'feature_importance': feature_importance or None,
+        'top_products': top_products or None,
+        'top_regions': top_regions or None,
+        'created_at': now
+    }
+    
+    with _writer(conn) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO forecasts (job_id, created_at, model_type, aggregation,
-                                  horizon, target_column, group_by, metrics,
-                                  forecast_data, historical_data, decomposition_data,
-                                  feature_importance, top_products, top_regions)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(_SQL_INSERT_FORECAST, (
             job_id, now, model_type, aggregation, horizon, target_column, group_by,
-            json.dumps(metrics), json.dumps(forecast_data), json.dumps(historical_data),
-            json.dumps(decomposition_data) if decomposition_data else None,
-            json.dumps(feature_importance) if feature_importance else None,
-            json.dumps(top_products) if top_products else None,
-            json.dumps(top_regions) if top_regions else None
+            _dumps(metrics), _dumps_series(forecast_data), _dumps_series(historical_data),
+            _dumps(decomposition_data) if decomposition_data else None,
+            _dumps(feature_importance) if feature_importance else None,
+            _dumps(top_products) if top_products else None,
+            _dumps(top_regions) if top_regions else None,
+            _dumps(response)
         ))
-        conn.commit()
-        return cursor.lastrowid
+        forecast_id = cursor.lastrowid
+        save_forecast_points(cursor, forecast_id, 'forecast', forecast_data)
+        save_forecast_points(cursor, forecast_id, 'historical', historical_data)
+        return forecast_id
+
+
+def save_forecast_points(cursor: sqlite3.Cursor, forecast_id: int, kind: str, points: List[Dict]) -> None:
+    """Batch-insert series points within the caller's transaction"""
+    cursor.executemany(_SQL_INSERT_FORECAST_POINT, [
+        (forecast_id, kind, p['date'], p.get('actual'), p.get('predicted'),
+         p.get('lower_bound'), p.get('upper_bound'))
+        for p in points
+    ])
 
 
 def get_latest_forecast(job_id: str) -> Optional[Dict[str, Any]]:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM forecasts WHERE job_id = ? ORDER BY created_at DESC LIMIT 1
-        """, (job_id,))
+        cursor.execute(_SQL_SELECT_LATEST_FORECAST, (job_id,))
         row = cursor.fetchone()
         
-        if row:
-            forecast = dict(row)
-            forecast['metrics'] = json.loads(forecast['metrics']) if forecast['metrics'] else {}
-            forecast['forecast_data'] = json.loads(forecast['forecast_data']) if forecast['forecast_data'] else []
-            forecast['historical_data'] = json.loads(forecast['historical_data']) if forecast['historical_data'] else []
-            forecast['decomposition_data'] = json.loads(forecast['decomposition_data']) if forecast['decomposition_data'] else None
-            forecast['feature_importance'] = json.loads(forecast['feature_importance']) if forecast['feature_importance'] else None
-            forecast['top_products'] = json.loads(forecast['top_products']) if forecast['top_products'] else None
-            forecast['top_regions'] = json.loads(forecast['top_regions']) if forecast['top_regions'] else None
-            return forecast
+        return _decode_forecast(dict(row)) if row else None
+
+
+def get_latest_forecast_version(job_id: str) -> Optional[Tuple[int, str]]:
+    """(id, created_at) of the latest forecast; forecasts are never updated, so this identifies its contents"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_SELECT_LATEST_FORECAST_VERSION, (job_id,))
+        row = cursor.fetchone()
+        
+        return (row['id'], row['created_at']) if row else None
+
+
+def get_forecast_frames(forecast_id: int) -> Optional[Dict[str, Any]]:
+    """Forecast with its forecast/historical series as DataFrames, read from Arrow without JSON"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_SELECT_FORECAST_SERIES, (forecast_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            'id': row['id'],
+            'created_at': row['created_at'],
+            'forecast': _load_series_table(row['forecast_data']).to_pandas(),
+            'historical': _load_series_table(row['historical_data']).to_pandas(),
+            'feature_importance': _loads(row['feature_importance'])
+        }
+
+
+def get_latest_forecast_response(job_id: str) -> Optional[bytes]:
+    """Serialized GET body of the latest forecast, or None when absent or written before caching"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_SELECT_LATEST_FORECAST_RESPONSE, (job_id,))
+        row = cursor.fetchone()
+        if row and row['response_cache'] is not None:
+            return _decompress(row['response_cache'])
         return None
 
 
 def save_insights(job_id: str, title: str, summary: str,
-                  kpis: List, bullets: List, recommendations: List) -> int:
-    now = datetime.utcnow().isoformat()
+                  kpis: List, bullets: List, recommendations: List,
+                  now: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    now = now or utcnow()
     
-    with get_connection() as conn:
+    with _writer(conn) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO insights (job_id, created_at, title, summary, kpis, bullets, recommendations)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(_SQL_INSERT_INSIGHTS, (
             job_id, now, title, summary,
-            json.dumps(kpis), json.dumps(bullets), json.dumps(recommendations)
+            _dumps(kpis), _dumps(bullets), _dumps(recommendations)
         ))
-        conn.commit()
         return cursor.lastrowid
 
 
 def get_latest_insights(job_id: str) -> Optional[Dict[str, Any]]:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM insights WHERE job_id = ? ORDER BY created_at DESC LIMIT 1
-        """, (job_id,))
+        cursor.execute(_SQL_SELECT_LATEST_INSIGHTS, (job_id,))
         row = cursor.fetchone()
         
-        if row:
-            insights = dict(row)
-            insights['kpis'] = json.loads(insights['kpis']) if insights['kpis'] else []
-            insights['bullets'] = json.loads(insights['bullets']) if insights['bullets'] else []
-            insights['recommendations'] = json.loads(insights['recommendations']) if insights['recommendations'] else []
-            return insights
-        return None
+        return _decode_insights(dict(row)) if row else None
 
 
 def get_recent_jobs(limit: int = 10) -> List[Dict[str, Any]]:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT j.job_id, j.created_at, j.original_filename, j.row_count, 
-                   j.column_count, j.status,
-                   f.model_type, f.aggregation, f.horizon, f.target_column,
-                   f.created_at as forecast_created_at
-            FROM jobs j
-            LEFT JOIN (
-                SELECT job_id, model_type, aggregation, horizon, target_column, created_at,
-                       ROW_NUMBER() OVER (PARTITION BY job_id ORDER BY created_at DESC) as rn
-                FROM forecasts
-            ) f ON j.job_id = f.job_id AND f.rn = 1
-            ORDER BY j.created_at DESC
-            LIMIT ?
-        """, (limit,))
+        cursor.execute(_SQL_SELECT_RECENT_JOBS, (limit,))
         
         rows = cursor.fetchall()
         result = []
@@ -236,15 +535,24 @@ def get_recent_jobs(limit: int = 10) -> List[Dict[str, Any]]:
 
 
 def get_job_with_forecast(job_id: str) -> Optional[Dict[str, Any]]:
-    job = get_job(job_id)
-    if not job:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_SELECT_JOB_WITH_FORECAST, (job_id,))
+        row = cursor.fetchone()
+    
+    if not row:
         return None
     
-    forecast = get_latest_forecast(job_id)
-    insights = get_latest_insights(job_id)
+    forecast = None
+    if row['f_id'] is not None:
+        forecast = _decode_forecast({c: row[f'f_{c}'] for c in _FORECAST_COLUMNS})
+    
+    insights = None
+    if row['i_id'] is not None:
+        insights = _decode_insights({c: row[f'i_{c}'] for c in _INSIGHTS_COLUMNS})
     
     return {
-        'job': job,
+        'job': _decode_job({c: row[c] for c in _JOB_COLUMNS}),
         'forecast': forecast,
         'insights': insights
     }
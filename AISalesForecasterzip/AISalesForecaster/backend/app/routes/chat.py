@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
 import logging
 
-from ..services.chat_service import ChatService
-
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -24,7 +24,7 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Chat with AI about forecast insights
     
@@ -37,11 +37,11 @@ async def chat(request: ChatRequest):
         AI response with metadata
     """
     try:
-        # Initialize chat service
-        service = ChatService()
+        # Shared service created in the app lifespan
+        service = http_request.app.state.chat_service
         
-        # Get response
-        result = service.chat(
+        # Async client: concurrent chats share pooled connections instead of threads
+        result = await service.chat_async(
             user_message=request.message,
             conversation_history=request.conversation_history or []
         )
@@ -55,9 +55,40 @@ async def chat(request: ChatRequest):
         )
     
     except Exception as e:
-        logger.error(f"Chat endpoint error: {str(e)}")
+        logger.error("Chat endpoint error: %s", e)
         return ChatResponse(
             success=False,
             response="Sorry, I encountered an error. Please try again.",
             error=str(e)
         )
+
+
+def _sse_tokens(service, request: ChatRequest) -> Iterator[bytes]:
+    # Headers are already sent once the first event goes out, so failures become an error event
+    try:
+        for token in service.chat_stream(request.message, request.conversation_history or []):
+            yield b"data: " + orjson.dumps({"content": token}) + b"\n\n"
+    except Exception as e:
+        logger.error("Chat stream error: %s", e)
+        yield b"event: error\ndata: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    yield b"data: [DONE]\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Chat with AI about forecast insights, streaming the reply as server-sent events
+    
+    Each event carries {"content": <text delta>}; the stream ends with "data: [DONE]".
+    """
+    service = http_request.app.state.chat_service
+    if not service.api_key:
+        raise HTTPException(status_code=503, detail="Chat service is not configured")
+    
+    # A sync iterator, so Starlette pulls it from the threadpool off the event loop;
+    # text/event-stream is also exempt from the GZip middleware, which would buffer tokens
+    return StreamingResponse(
+        _sse_tokens(service, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
@@ -1,6 +1,8 @@
 import logging
 from fastapi import APIRouter, HTTPException
-from ..models.database import get_connection
+from ..models.database import delete_job as delete_job_record, get_job
+from ..services.data_pipeline import remove_upload
+from ..utils.report_cache import evict_report_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -10,23 +12,18 @@ router = APIRouter()
 async def delete_job(job_id: str):
     """Delete a job and all its associated data (forecasts, uploads)"""
     try:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Delete forecast data
-            cursor.execute("DELETE FROM forecasts WHERE job_id = ?", (job_id,))
-            
-            # Delete insights data
-            cursor.execute("DELETE FROM insights WHERE job_id = ?", (job_id,))
-            
-            # Delete job
-            cursor.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
-            
-            conn.commit()
+        job = get_job(job_id)
         
-        logger.info(f"Deleted job {job_id} and all associated data")
+        # Forecasts and insights are removed by the jobs delete trigger
+        delete_job_record(job_id)
+        evict_report_cache(job_id)
+        # The upload path comes from the job row, never from the request
+        if job and job.get('file_path'):
+            remove_upload(job['file_path'])
+        
+        logger.info("Deleted job %s and all associated data", job_id)
         return {"status": "success", "message": f"Job {job_id} deleted"}
         
     except Exception as e:
-        logger.error(f"Error deleting job {job_id}: {str(e)}")
+        logger.error("Error deleting job %s: %s", job_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to delete job: {str(e)}")
@@ -1,35 +1,72 @@
 import os
+import math
+import asyncio
 import pandas as pd
-import numpy as np
-from fastapi import APIRouter, HTTPException
-from typing import Optional, Any
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, List, Optional
 import logging
 
 from ..models.schemas import (
     ForecastRequest, ForecastResponse, ModelType, AggregationType
 )
 from ..models.database import (
-    get_job, update_job_status, save_forecast, get_latest_forecast
+    get_job, update_job_status, save_forecast, get_latest_forecast,
+    get_latest_forecast_response, get_latest_forecast_version, transaction, utcnow
 )
-from ..services.data_pipeline import DataPipeline
+from ..services.data_pipeline import DataPipeline, load_job_frame
 from ..services.forecaster import Forecaster
+from ..utils.helpers import make_etag, etag_headers, not_modified
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def clean_nan_inf(obj: Any) -> Any:
-    """Recursively clean NaN and infinity values from nested structures for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: clean_nan_inf(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_nan_inf(item) for item in obj]
-    elif isinstance(obj, float):
-        if np.isnan(obj) or np.isinf(obj):
-            return 0.0
-        return obj
-    else:
-        return obj
+def _forecast_input_columns(request: ForecastRequest) -> List[str]:
+    """Upload columns the modeling pipeline and the top products/regions tables read"""
+    columns = DataPipeline.DATE_COLUMN_ALIASES + DataPipeline.NUMERIC_COLUMNS + DataPipeline.OPTIONAL_COLUMNS
+    columns = columns + [request.target_column]
+    if request.group_by:
+        columns.append(request.group_by)
+    return columns
+
+
+async def _top_by_column(pipeline: DataPipeline, df: pd.DataFrame, column: Optional[str],
+                         target_column: str) -> Optional[List[Dict[str, Any]]]:
+    if column is None:
+        return None
+    return await asyncio.to_thread(pipeline.get_top_by_column, df, column, target_column, 5)
+
+
+def _persist_forecast(request: ForecastRequest, metrics: Dict, forecast_data: List, historical_data: List,
+                      decomposition_data: Optional[Dict], feature_importance: Optional[List],
+                      top_products: Optional[List], top_regions: Optional[List]) -> None:
+    # The forecast and the job's completed status are committed together, with one timestamp
+    now = utcnow()
+    with transaction() as conn:
+        save_forecast(
+            job_id=request.job_id,
+            model_type=request.model.value,
+            aggregation=request.aggregation.value,
+            horizon=request.horizon,
+            target_column=request.target_column,
+            group_by=request.group_by,
+            metrics=metrics,
+            forecast_data=forecast_data,
+            historical_data=historical_data,
+            decomposition_data=decomposition_data,
+            feature_importance=feature_importance,
+            top_products=top_products,
+            top_regions=top_regions,
+            now=now,
+            conn=conn
+        )
+        update_job_status(request.job_id, 'completed', now=now, conn=conn)
+
+
+def finite_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Zero out NaN/infinity in the flat metrics dict; the series are already sanitized by the Forecaster"""
+    return {k: 0.0 if isinstance(v, float) and not math.isfinite(v) else v for k, v in metrics.items()}
 
 
 @router.post("/forecast", response_model=ForecastResponse)
@@ -44,16 +81,7 @@ async def run_forecast(request: ForecastRequest):
     try:
         update_job_status(request.job_id, 'processing')
         
-        encodings_to_try = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-        df = None
-        for encoding in encodings_to_try:
-            try:
-                df = pd.read_csv(job['file_path'], encoding=encoding)
-                logger.info(f"Successfully parsed forecast CSV with encoding: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
-        
+        df = load_job_frame(job['file_path'], columns=_forecast_input_columns(request))
         if df is None:
             raise HTTPException(status_code=400, detail="Unable to parse CSV file with any known encoding")
         
@@ -77,71 +105,70 @@ async def run_forecast(request: ForecastRequest):
             aggregation=request.aggregation
         )
         
-        top_products = None
-        top_regions = None
-        
-        if 'product_name' in df.columns or 'product_id' in df.columns:
-            product_col = 'product_name' if 'product_name' in df.columns else 'product_id'
-            top_products = pipeline.get_top_by_column(df, product_col, request.target_column, n=5)
-        
-        if 'region' in df.columns:
-            top_regions = pipeline.get_top_by_column(df, 'region', request.target_column, n=5)
-        
-        save_forecast(
-            job_id=request.job_id,
-            model_type=request.model.value,
-            aggregation=request.aggregation.value,
-            horizon=request.horizon,
-            target_column=request.target_column,
-            group_by=request.group_by,
-            metrics=results['metrics'].model_dump(),
-            forecast_data=[f.model_dump() for f in results['forecast']],
-            historical_data=[h.model_dump() for h in results['historical']],
-            decomposition_data=results['decomposition'].model_dump() if results['decomposition'] else None,
-            feature_importance=[fi.model_dump() for fi in results['feature_importance']] if results['feature_importance'] else None,
-            top_products=top_products,
-            top_regions=top_regions
+        # The two top-N tallies are independent groupbys; run them side by side
+        product_col = next((col for col in ('product_name', 'product_id') if col in df.columns), None)
+        top_products, top_regions = await asyncio.gather(
+            _top_by_column(pipeline, df, product_col, request.target_column),
+            _top_by_column(pipeline, df, 'region' if 'region' in df.columns else None, request.target_column)
         )
         
-        update_job_status(request.job_id, 'completed')
-        
-        # Clean NaN/infinity values from response data
-        metrics_dict = clean_nan_inf(results['metrics'].model_dump())
-        forecast_data = clean_nan_inf([f.model_dump() for f in results['forecast']])
-        historical_data = clean_nan_inf([h.model_dump() for h in results['historical']])
-        decomp_data = clean_nan_inf(results['decomposition'].model_dump()) if results['decomposition'] else None
-        feat_imp = clean_nan_inf([fi.model_dump() for fi in results['feature_importance']]) if results['feature_importance'] else None
+        metrics_dict = finite_metrics(results['metrics'].model_dump())
+        forecast_data = [f.model_dump() for f in results['forecast']]
+        historical_data = [h.model_dump() for h in results['historical']]
+        decomp_data = results['decomposition'].model_dump() if results['decomposition'] else None
+        feat_imp = [fi.model_dump() for fi in results['feature_importance']] if results['feature_importance'] else None
         
-        return ForecastResponse(
-            job_id=request.job_id,
-            model_type=request.model.value,
-            aggregation=request.aggregation.value,
-            horizon=request.horizon,
-            target_column=request.target_column,
-            metrics=metrics_dict,
-            forecast=forecast_data,
-            historical=historical_data,
-            decomposition=decomp_data,
-            feature_importance=feat_imp,
-            top_products=top_products,
-            top_regions=top_regions
+        await asyncio.to_thread(
+            _persist_forecast, request,
+            metrics_dict, forecast_data, historical_data, decomp_data, feat_imp,
+            top_products, top_regions
         )
         
+        # The dicts were dumped from validated models, so they go straight to orjson
+        # rather than being validated into a second ForecastResponse
+        return ORJSONResponse({
+            'job_id': request.job_id,
+            'model_type': request.model.value,
+            'aggregation': request.aggregation.value,
+            'horizon': request.horizon,
+            'target_column': request.target_column,
+            'metrics': metrics_dict,
+            'forecast': forecast_data,
+            'historical': historical_data,
+            'decomposition': decomp_data,
+            'feature_importance': feat_imp,
+            'top_products': top_products,
+            'top_regions': top_regions
+        })
+        
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Forecast error: {str(e)}")
+        logger.error("Forecast error: %s", e)
         update_job_status(request.job_id, 'error')
         raise HTTPException(status_code=500, detail=f"Forecasting error: {str(e)}")
 
 
 @router.get("/forecast/{job_id}")
-async def get_forecast(job_id: str):
+async def get_forecast(request: Request, job_id: str):
+    version = get_latest_forecast_version(job_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="No forecast found for this job")
+    
+    etag = make_etag(*version)
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    cached = get_latest_forecast_response(job_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=etag_headers(etag))
+    
     forecast = get_latest_forecast(job_id)
     if not forecast:
         raise HTTPException(status_code=404, detail="No forecast found for this job")
     
-    return {
+    return ORJSONResponse({
         'job_id': job_id,
         'model_type': forecast['model_type'],
         'aggregation': forecast['aggregation'],
@@ -155,4 +182,4 @@ async def get_forecast(job_id: str):
         'top_products': forecast['top_products'],
         'top_regions': forecast['top_regions'],
         'created_at': forecast['created_at']
-    }
+    }, headers=etag_headers(etag))
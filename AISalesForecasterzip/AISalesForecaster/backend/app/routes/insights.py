@@ -1,26 +1,30 @@
 import os
-import pandas as pd
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 import logging
 
 from ..models.schemas import InsightsResponse, ForecastMetrics, FeatureImportance
 from ..models.database import (
-    get_job, get_latest_forecast, save_insights, get_latest_insights
+    get_job, get_latest_forecast, get_latest_forecast_version, save_insights, get_latest_insights
 )
+from ..services.data_pipeline import load_job_frame
 from ..services.insights_generator import InsightsGenerator
+from ..utils.helpers import model_json_response, make_etag, etag_headers, not_modified
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Columns InsightsGenerator reads besides the target
+_INSIGHTS_INPUT_COLUMNS = ['date', 'month', 'promotion_flag', 'price']
+
 
 @router.get("/insights", response_model=InsightsResponse)
-async def get_insights(job_id: str = Query(..., description="Job ID from forecast")):
+async def get_insights(request: Request, job_id: str = Query(..., description="Job ID from forecast")):
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    forecast = get_latest_forecast(job_id)
-    if not forecast:
+    # Existence check only; the full forecast is loaded when insights must be generated
+    if not get_latest_forecast_version(job_id):
         raise HTTPException(
             status_code=404, 
             detail="No forecast found. Please run a forecast first."
@@ -29,7 +33,11 @@ async def get_insights(job_id: str = Query(..., description="Job ID from forecas
     try:
         existing_insights = get_latest_insights(job_id)
         if existing_insights:
-            return InsightsResponse(
+            etag = make_etag(existing_insights['id'], existing_insights['created_at'])
+            unchanged = not_modified(request, etag)
+            if unchanged is not None:
+                return unchanged
+            return model_json_response(InsightsResponse(
                 job_id=job_id,
                 title=existing_insights['title'],
                 summary=existing_insights['summary'],
@@ -37,13 +45,16 @@ async def get_insights(job_id: str = Query(..., description="Job ID from forecas
                 bullets=existing_insights['bullets'],
                 recommendations=existing_insights['recommendations'],
                 generated_at=existing_insights['created_at']
-            )
+            ), headers=etag_headers(etag))
         
-        df = pd.read_csv(job['file_path'])
-        df['date'] = pd.to_datetime(df['date'])
+        forecast = get_latest_forecast(job_id)
+        if not forecast:
+            raise HTTPException(
+                status_code=404, 
+                detail="No forecast found. Please run a forecast first."
+            )
         
-        if 'month' not in df.columns:
-            df['month'] = df['date'].dt.month
+        df = load_job_frame(job['file_path'], columns=_INSIGHTS_INPUT_COLUMNS + [forecast['target_column']])
         
         metrics = ForecastMetrics(**forecast['metrics'])
         
@@ -63,24 +74,27 @@ async def get_insights(job_id: str = Query(..., description="Job ID from forecas
         
         insights = generator.generate_insights()
         
-        save_insights(
+        # Stored under the generator's timestamp so this body and later cached ones match the ETag
+        now = insights['generated_at']
+        insights_id = save_insights(
             job_id=job_id,
             title=insights['title'],
             summary=insights['summary'],
             kpis=insights['kpis'],
             bullets=insights['bullets'],
-            recommendations=insights['recommendations']
+            recommendations=insights['recommendations'],
+            now=now
         )
         
-        return InsightsResponse(
+        return model_json_response(InsightsResponse(
             job_id=job_id,
             **insights
-        )
+        ), headers=etag_headers(make_etag(insights_id, now)))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Insights generation error: {str(e)}")
+        logger.error("Insights generation error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 
@@ -95,11 +109,7 @@ async def regenerate_insights(job_id: str = Query(...)):
         raise HTTPException(status_code=404, detail="No forecast found")
     
     try:
-        df = pd.read_csv(job['file_path'])
-        df['date'] = pd.to_datetime(df['date'])
-        
-        if 'month' not in df.columns:
-            df['month'] = df['date'].dt.month
+        df = load_job_frame(job['file_path'], columns=_INSIGHTS_INPUT_COLUMNS + [forecast['target_column']])
         
         metrics = ForecastMetrics(**forecast['metrics'])
         
@@ -128,11 +138,11 @@ async def regenerate_insights(job_id: str = Query(...)):
             recommendations=insights['recommendations']
         )
         
-        return InsightsResponse(
+        return model_json_response(InsightsResponse(
             job_id=job_id,
             **insights
-        )
+        ))
         
     except Exception as e:
-        logger.error(f"Insights regeneration error: {str(e)}")
+        logger.error("Insights regeneration error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error regenerating insights: {str(e)}")
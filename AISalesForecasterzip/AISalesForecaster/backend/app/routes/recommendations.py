@@ -1,63 +1,101 @@
 import logging
-import pandas as pd
-import json
-from fastapi import APIRouter, HTTPException
-from ..models.database import get_latest_forecast
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from ..models.database import (
+    get_latest_forecast, get_latest_forecast_version, get_forecast_frames
+)
 from ..services.anomaly_detector import AnomalyDetector, RecommendationEngine, ScenarioSimulator
+from ..utils.helpers import make_etag, etag_headers, not_modified
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Anomalies and recommendations are pure functions of a forecast row, and a row
+# is never modified after insert, so the serialized body is cached per
+# (forecast id, created_at). A new forecast for the job gets a new key; stale
+# entries simply age out of the LRU.
+RESPONSE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _anomalies_body(job_id: str, forecast_id: int, created_at: str) -> Optional[bytes]:
+    forecast = get_forecast_frames(forecast_id)
+    if not forecast:
+        return None
+    
+    anomalies = AnomalyDetector.detect_anomalies(
+        forecast['historical'],
+        value_column='actual'
+    )
+    
+    return orjson.dumps({
+        'job_id': job_id,
+        'anomalies': anomalies,
+        'count': len(anomalies)
+    })
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _recommendations_body(job_id: str, forecast_id: int, created_at: str) -> Optional[bytes]:
+    forecast = get_forecast_frames(forecast_id)
+    if not forecast:
+        return None
+    
+    recommendations = RecommendationEngine.generate_recommendations(
+        forecast['forecast']['predicted'].to_numpy(dtype=np.float64, na_value=np.nan),
+        forecast['historical']['actual'].to_numpy(dtype=np.float64, na_value=np.nan),
+        forecast['feature_importance']
+    )
+    
+    return orjson.dumps({
+        'job_id': job_id,
+        'recommendations': recommendations,
+        'count': len(recommendations)
+    })
+
+
+def _cached_response(body_fn, request: Request, job_id: str) -> Response:
+    version = get_latest_forecast_version(job_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Forecast not found")
+    
+    etag = make_etag(body_fn.__name__, *version)
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    body = body_fn(job_id, *version)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Forecast not found")
+    return Response(content=body, media_type="application/json", headers=etag_headers(etag))
+
 
 @router.get("/anomalies/{job_id}")
-async def get_anomalies(job_id: str):
+async def get_anomalies(request: Request, job_id: str):
     """Get detected anomalies for a forecast"""
     try:
-        forecast = get_latest_forecast(job_id)
-        if not forecast:
-            raise HTTPException(status_code=404, detail="Forecast not found")
-        
-        historical_data = json.loads(forecast['historical_data'])
-        anomalies = AnomalyDetector.detect_anomalies(
-            pd.DataFrame(historical_data),
-            value_column='actual'
-        )
-        
-        return {
-            'job_id': job_id,
-            'anomalies': anomalies,
-            'count': len(anomalies)
-        }
+        return _cached_response(_anomalies_body, request, job_id)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error detecting anomalies: {str(e)}")
+        logger.error("Error detecting anomalies: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/recommendations/{job_id}")
-async def get_recommendations(job_id: str):
+async def get_recommendations(request: Request, job_id: str):
     """Get AI recommendations for revenue optimization"""
     try:
-        forecast = get_latest_forecast(job_id)
-        if not forecast:
-            raise HTTPException(status_code=404, detail="Forecast not found")
-        
-        forecast_data = json.loads(forecast['forecast_data'])
-        historical_data = json.loads(forecast['historical_data'])
-        feature_importance = json.loads(forecast['feature_importance']) if forecast['feature_importance'] else None
-        
-        recommendations = RecommendationEngine.generate_recommendations(
-            forecast_data,
-            historical_data,
-            feature_importance
-        )
-        
-        return {
-            'job_id': job_id,
-            'recommendations': recommendations,
-            'count': len(recommendations)
-        }
+        return _cached_response(_recommendations_body, request, job_id)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error generating recommendations: {str(e)}")
+        logger.error("Error generating recommendations: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -69,11 +107,10 @@ async def run_scenario(job_id: str, scenario_params: dict):
         if not forecast:
             raise HTTPException(status_code=404, detail="Forecast not found")
         
-        forecast_data = json.loads(forecast['forecast_data'])
-        
-        result = ScenarioSimulator.simulate_scenario(forecast_data, scenario_params)
+        result = ScenarioSimulator.simulate_scenario(forecast['forecast_data'], scenario_params)
         
-        return result
+        # Returned as a response so FastAPI doesn't walk every point through jsonable_encoder first
+        return ORJSONResponse(result)
     except Exception as e:
-        logger.error(f"Error simulating scenario: {str(e)}")
+        logger.error("Error simulating scenario: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,13 +1,14 @@
 import os
-import pandas as pd
+import aiofiles
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List
 import logging
 
 from ..models.schemas import UploadResponse, ValidationResult
 from ..models.database import create_job, get_job, get_recent_jobs, get_job_with_forecast
-from ..services.data_pipeline import DataPipeline
-from ..utils.helpers import generate_job_id
+from ..services.data_pipeline import DataPipeline, compact_dtypes, read_csv_file, save_sidecar
+from ..utils.helpers import generate_job_id, model_json_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -15,41 +16,42 @@ logger = logging.getLogger(__name__)
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "backend/uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _discard_upload(file_path: str) -> None:
+    try:
+        os.unlink(file_path)
+    except OSError:
+        pass
+
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_csv(file: UploadFile = File(...)):
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are accepted")
     
+    job_id = generate_job_id()
+    file_path = os.path.join(UPLOAD_DIR, f"{job_id}.csv")
+    
     try:
-        contents = await file.read()
+        # Stream to disk so memory stays at one chunk regardless of upload size
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
         
-        encodings_to_try = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-        df = None
-        last_error = None
-        
-        for encoding in encodings_to_try:
-            try:
-                df = pd.read_csv(pd.io.common.BytesIO(contents), encoding=encoding)
-                logger.info(f"Successfully parsed CSV with encoding: {encoding}")
-                break
-            except UnicodeDecodeError as e:
-                last_error = e
-                continue
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
-        
-        if df is None:
-            raise HTTPException(status_code=400, detail=f"Unable to parse CSV file. Please ensure it's a valid CSV with text encoding (UTF-8, Latin-1, or Windows format).")
+        try:
+            df = read_csv_file(file_path)
+        except Exception as e:
+            _discard_upload(file_path)
+            raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
         
         if len(df) == 0:
+            _discard_upload(file_path)
             raise HTTPException(status_code=400, detail="CSV file is empty")
         
-        job_id = generate_job_id()
-        
-        file_path = os.path.join(UPLOAD_DIR, f"{job_id}.csv")
-        with open(file_path, 'wb') as f:
-            f.write(contents)
+        compact_dtypes(df)
+        save_sidecar(df, file_path)
         
         pipeline = DataPipeline(df)
         validation_result = pipeline.validate()
@@ -70,19 +72,19 @@ async def upload_csv(file: UploadFile = File(...)):
             validation_result=validation_result.model_dump()
         )
         
-        return UploadResponse(
+        return model_json_response(UploadResponse(
             job_id=job_id,
             validation=validation_result,
             preview=preview,
             columns=all_columns,
             numeric_columns=numeric_columns,
             categorical_columns=categorical_columns
-        )
+        ))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
+        logger.error("Upload error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 
@@ -105,4 +107,5 @@ async def get_job_full_data(job_id: str):
     data = get_job_with_forecast(job_id)
     if not data:
         raise HTTPException(status_code=404, detail="Job not found")
-    return data
+    # Carries the full forecast series; skip the jsonable_encoder pass over it
+    return ORJSONResponse(data)
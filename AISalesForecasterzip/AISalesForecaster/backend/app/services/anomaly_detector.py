@@ -7,6 +7,53 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _anomaly_kernel(values: np.ndarray, method: str, threshold: float):
+    """
+    Flag outliers in one sweep over a float64 series (NaN = missing)
+    
+    Returns (indices, pct_change, is_spike, z_scores, mean) for the flagged points,
+    with z_scores None for the IQR method, or None when there is nothing to flag
+    """
+    valid = ~np.isnan(values)
+    clean = values[valid]
+    if not len(clean):
+        return None
+    mean = clean.mean()
+    
+    if method == 'iqr':
+        q1, q3 = np.percentile(clean, [25, 75])
+        iqr = q3 - q1
+        lower_bound = q1 - (threshold * iqr)
+        upper_bound = q3 + (threshold * iqr)
+        
+        # NaN compares False, so missing points never pass either bound
+        mask = values < lower_bound
+        mask |= values > upper_bound
+        idx = np.flatnonzero(mask)
+        spikes = values[idx] > upper_bound
+        z_scores = None
+    elif method == 'zscore':
+        std = clean.std()
+        if std == 0:
+            return None
+        
+        deviation = values - mean
+        np.abs(deviation, out=deviation)
+        deviation /= std
+        idx = np.flatnonzero(deviation > threshold)
+        spikes = values[idx] > mean
+        z_scores = deviation[idx]
+    else:
+        return None
+    
+    if not len(idx):
+        return None
+    
+    picked = values[idx]
+    pct_change = (picked - mean) / mean * 100 if mean != 0 else np.zeros(len(idx))
+    return idx, pct_change, spikes, z_scores, mean
+
+
 class AnomalyDetector:
     """Detects anomalies in time series data using IQR and Z-score methods"""
     
@@ -30,79 +77,70 @@ class AnomalyDetector:
         if value_column not in df.columns or len(df) < 3:
             return anomalies
         
-        values = df[value_column].dropna().values
+        values = df[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        flagged = _anomaly_kernel(values, method, threshold)
+        if flagged is None:
+            return anomalies
+        idx, pct_change, spikes, z_scores, mean = flagged
+        severity = np.round(np.abs(pct_change), 1)
+        
+        # Top 10 by severity; a stable sort keeps ties in date order
+        top = np.argsort(-severity, kind='stable')[:10]
+        idx = idx[top]
+        
+        dates = df['date'].iloc[idx]
+        if pd.api.types.is_datetime64_dtype(dates):
+            # One C loop over the raw datetime64 values instead of a strftime per row
+            date_strs = np.datetime_as_string(dates.to_numpy(), unit='D').tolist()
+        elif pd.api.types.is_datetime64_any_dtype(dates):
+            # Timezone-aware: keep the local calendar date
+            date_strs = dates.dt.strftime('%Y-%m-%d').tolist()
+        else:
+            date_strs = dates.astype(str).tolist()
+        
+        anomaly_types = np.where(spikes[top], 'spike', 'dip').tolist()
+        top_values = values[idx].tolist()
+        top_pct = np.abs(pct_change[top]).tolist()
+        top_severity = severity[top].tolist()
         
         if method == 'iqr':
-            Q1 = np.percentile(values, 25)
-            Q3 = np.percentile(values, 75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - (threshold * IQR)
-            upper_bound = Q3 + (threshold * IQR)
-            
-            for idx, row in df.iterrows():
-                value = row[value_column]
-                if pd.isna(value):
-                    continue
-                
-                if value < lower_bound or value > upper_bound:
-                    # Calculate percentage change from mean
-                    mean_val = np.mean(values)
-                    pct_change = ((value - mean_val) / mean_val * 100) if mean_val != 0 else 0
-                    
-                    anomaly_type = "spike" if value > upper_bound else "dip"
-                    severity = abs(pct_change)
-                    
-                    anomalies.append({
-                        'date': row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date']),
-                        'value': float(value),
-                        'anomaly_type': anomaly_type,
-                        'severity': round(severity, 1),
-                        'description': f"AI detected {anomaly_type} on {row['date'].strftime('%Y-%m-%d')}: {abs(pct_change):.1f}% {'increase' if value > mean_val else 'decrease'}"
-                    })
-        
-        elif method == 'zscore':
-            mean = np.mean(values)
-            std = np.std(values)
-            
-            if std == 0:
-                return anomalies
-            
-            for idx, row in df.iterrows():
-                value = row[value_column]
-                if pd.isna(value):
-                    continue
-                
-                z_score = abs((value - mean) / std)
-                
-                if z_score > threshold:
-                    pct_change = ((value - mean) / mean * 100) if mean != 0 else 0
-                    anomaly_type = "spike" if value > mean else "dip"
-                    
-                    anomalies.append({
-                        'date': row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date']),
-                        'value': float(value),
-                        'anomaly_type': anomaly_type,
-                        'severity': round(abs(pct_change), 1),
-                        'z_score': round(z_score, 2),
-                        'description': f"AI detected {anomaly_type} on {row['date'].strftime('%Y-%m-%d')}: {abs(pct_change):.1f}% change"
-                    })
-        
-        return sorted(anomalies, key=lambda x: x['severity'], reverse=True)[:10]  # Top 10 anomalies
+            return [
+                {
+                    'date': date_strs[i],
+                    'value': top_values[i],
+                    'anomaly_type': anomaly_types[i],
+                    'severity': top_severity[i],
+                    'description': f"AI detected {anomaly_types[i]} on {date_strs[i]}: {top_pct[i]:.1f}% {'increase' if top_values[i] > mean else 'decrease'}"
+                }
+                for i in range(len(idx))
+            ]
+        
+        top_z = np.round(z_scores[top], 2).tolist()
+        return [
+            {
+                'date': date_strs[i],
+                'value': top_values[i],
+                'anomaly_type': anomaly_types[i],
+                'severity': top_severity[i],
+                'z_score': top_z[i],
+                'description': f"AI detected {anomaly_types[i]} on {date_strs[i]}: {top_pct[i]:.1f}% change"
+            }
+            for i in range(len(idx))
+        ]
 
 
 class RecommendationEngine:
     """Generates revenue and business recommendations based on forecast data"""
     
     @staticmethod
-    def generate_recommendations(forecast_data: List[Dict], historical_data: List[Dict],
+    def generate_recommendations(forecast_values: np.ndarray, historical_values: np.ndarray,
                                 feature_importance: List[Dict] = None) -> List[Dict[str, Any]]:
         """
         Generate actionable business recommendations
         
         Args:
-            forecast_data: List of forecast points with predictions
-            historical_data: List of historical data points
+            forecast_values: Predicted values of the forecast points, in date order
+            historical_values: Actual values of the historical points, NaN where missing
             feature_importance: List of important features
         
         Returns:
@@ -110,12 +148,15 @@ class RecommendationEngine:
         """
         recommendations = []
         
-        if not forecast_data or not historical_data:
+        if not len(forecast_values) or not len(historical_values):
             return recommendations
         
-        # Calculate growth trend
-        avg_historical = np.mean([h.get('actual', 0) for h in historical_data[-12:] if h.get('actual')])
-        avg_forecast = np.mean([f.get('predicted', 0) for f in forecast_data[:6]])
+        recent = historical_values[-12:]
+        
+        # Calculate growth trend over the recorded (non-missing, non-zero) recent actuals
+        observed = recent[~np.isnan(recent) & (recent != 0)]
+        avg_historical = observed.mean() if len(observed) else 0
+        avg_forecast = forecast_values[:6].mean()
         growth_rate = ((avg_forecast - avg_historical) / avg_historical * 100) if avg_historical > 0 else 0
         
         # Recommendation 1: Growth-based pricing
@@ -141,24 +182,23 @@ class RecommendationEngine:
             })
         
         # Recommendation 2: Based on volatility
-        forecast_values = [f.get('predicted', 0) for f in forecast_data]
-        if forecast_values:
-            volatility = np.std(forecast_values) / (np.mean(forecast_values) or 1) * 100
-            if volatility > 30:
-                recommendations.append({
-                    'id': 'inventory_buffer',
-                    'title': 'Increase Safety Stock',
-                    'description': f'High volatility detected ({volatility:.1f}%). Recommend {int(volatility / 5)} weeks of buffer inventory.',
-                    'impact': 'medium',
-                    'action': 'Increase safety stock',
-                    'expected_uplift': 'Reduce stockout risk by ~40%'
-                })
+        volatility = forecast_values.std() / (forecast_values.mean() or 1) * 100
+        if volatility > 30:
+            recommendations.append({
+                'id': 'inventory_buffer',
+                'title': 'Increase Safety Stock',
+                'description': f'High volatility detected ({volatility:.1f}%). Recommend {int(volatility / 5)} weeks of buffer inventory.',
+                'impact': 'medium',
+                'action': 'Increase safety stock',
+                'expected_uplift': 'Reduce stockout risk by ~40%'
+            })
         
         # Recommendation 3: Seasonal opportunity
-        if len(historical_data) > 30:
-            max_month = max([h.get('actual', 0) for h in historical_data[-12:]])
-            min_month = min([h.get('actual', 0) for h in historical_data[-12:]])
-            seasonality = ((max_month - min_month) / min_month * 100) if min_month > 0 else 0
+        if len(historical_values) > 30:
+            # Missing actuals count as 0, as before, which rules out a seasonality ratio
+            filled = np.nan_to_num(recent, nan=0.0)
+            min_month = filled.min()
+            seasonality = (np.ptp(filled) / min_month * 100) if min_month > 0 else 0
             
             if seasonality > 30:
                 recommendations.append({
@@ -205,20 +245,21 @@ class ScenarioSimulator:
         price_change = scenario_params.get('price_change', 0) / 100
         volume_change = scenario_params.get('volume_change', 0) / 100
         
-        original_revenue = sum(f.get('predicted', 0) for f in forecast_data)
+        original = np.fromiter(
+            (f.get('predicted', 0) for f in forecast_data), dtype=np.float64, count=len(forecast_data)
+        )
         
         # Simulate elasticity: for every 1% price change, volume changes by -0.5% (typical elasticity)
         actual_volume_change = volume_change - (price_change * 0.5)
         
-        new_forecast = []
-        for point in forecast_data:
-            new_predicted = point.get('predicted', 0) * (1 + actual_volume_change) * (1 + price_change)
-            new_forecast.append({
-                **point,
-                'predicted_scenario': new_predicted
-            })
+        scenario = original * (1 + actual_volume_change) * (1 + price_change)
+        new_forecast = [
+            {**point, 'predicted_scenario': value}
+            for point, value in zip(forecast_data, scenario.tolist())
+        ]
         
-        new_revenue = sum(f.get('predicted_scenario', 0) for f in new_forecast)
+        original_revenue = float(original.sum())
+        new_revenue = float(scenario.sum())
         revenue_change = new_revenue - original_revenue
         revenue_change_pct = (revenue_change / original_revenue * 100) if original_revenue > 0 else 0
         
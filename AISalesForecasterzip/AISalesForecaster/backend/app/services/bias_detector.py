@@ -6,6 +6,33 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _bias_scalars(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[np.ndarray, Dict[str, float]]:
+    """
+    Residuals plus every scalar reduction over them, computed once each
+    
+    Allocates the residuals and one scratch array (reused in place for the
+    absolute and relative errors) instead of a temporary per statistic.
+    """
+    residuals = y_true - y_pred
+    n = len(residuals)
+    
+    scratch = np.abs(residuals)
+    mean_abs = scratch.mean()
+    denominator = np.abs(y_true)
+    denominator += 1
+    scratch /= denominator
+    
+    return residuals, {
+        'mean_true': y_true.mean(),
+        'mean_bias': residuals.mean(),
+        'over_pct': np.count_nonzero(residuals < 0) / n * 100,
+        'under_pct': np.count_nonzero(residuals > 0) / n * 100,
+        'std': residuals.std(),
+        'mean_abs': mean_abs,
+        'mape': scratch.mean() * 100
+    }
+
+
 class BiasDetector:
     """Detects prediction bias in forecasting models"""
     
@@ -23,31 +50,32 @@ class BiasDetector:
         Returns:
             Dictionary with bias metrics
         """
-        residuals = y_true - y_pred
+        y_true = np.asarray(y_true, dtype=np.float64)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        residuals, stats = _bias_scalars(y_true, y_pred)
+        mean_true = stats['mean_true']
         
         # Overall bias
-        mean_bias = np.mean(residuals)
-        overall_overprediction = np.sum(residuals < 0) / len(residuals) * 100
-        overall_underprediction = np.sum(residuals > 0) / len(residuals) * 100
+        overall_overprediction = stats['over_pct']
+        overall_underprediction = stats['under_pct']
         
         # Bias percentage (signed percentage error)
-        bias_pct = (mean_bias / np.mean(y_true)) * 100 if np.mean(y_true) != 0 else 0
+        bias_pct = (stats['mean_bias'] / mean_true) * 100 if mean_true != 0 else 0
         
         quarterly_bias = {}
         if dates:
-            df_temp = pd.DataFrame({
-                'date': pd.to_datetime(dates),
-                'residual': residuals
-            })
-            df_temp['quarter'] = df_temp['date'].dt.to_period('Q')
-            
-            for quarter, group in df_temp.groupby('quarter'):
-                q_bias = (np.mean(group['residual']) / np.mean(y_true)) * 100 if np.mean(y_true) != 0 else 0
-                quarterly_bias[str(quarter)] = round(q_bias, 2)
+            # One grouped mean over all quarters, scaled by the precomputed mean
+            quarters = pd.PeriodIndex(pd.to_datetime(dates), freq='Q')
+            quarter_means = pd.Series(residuals).groupby(quarters).mean()
+            if mean_true != 0:
+                quarter_bias = (quarter_means / mean_true * 100).round(2)
+            else:
+                quarter_bias = pd.Series(0, index=quarter_means.index)
+            quarterly_bias = {str(quarter): bias for quarter, bias in quarter_bias.items()}
         
         # Determine risk level based on volatility of residuals
-        residual_std = np.std(residuals)
-        residual_mean = np.mean(np.abs(residuals))
+        residual_std = stats['std']
+        residual_mean = stats['mean_abs']
         
         if residual_std > residual_mean * 1.5:
             risk_level = 'high'
@@ -57,7 +85,7 @@ class BiasDetector:
             risk_level = 'low'
         
         # Confidence score (inverse of MAPE-like metric)
-        mean_absolute_percentage_error = np.mean(np.abs(residuals / (np.abs(y_true) + 1))) * 100
+        mean_absolute_percentage_error = stats['mape']
         confidence_score = max(0, 100 - mean_absolute_percentage_error)
         
         return {
@@ -1,12 +1,39 @@
 import os
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
 from datetime import datetime
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Pools are sized for many chats in flight at once (threads or event-loop tasks)
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 50
+
+
+def _sse_content(line: str) -> Optional[str]:
+    """
+    Content delta carried by one OpenRouter server-sent event line: '' for lines
+    without one (blank, ":" keep-alive comments, role-only deltas), None at "data: [DONE]"
+    """
+    if not line.startswith("data: "):
+        return ''
+    data = line[6:]
+    if data == "[DONE]":
+        return None
+    
+    chunk = json.loads(data)
+    if 'error' in chunk:
+        raise RuntimeError(chunk['error'].get('message', 'stream error'))
+    
+    choices = chunk.get('choices') or [{}]
+    return (choices[0].get('delta') or {}).get('content') or ''
+
 
 class ChatService:
     """AI-powered chat service for sales forecasting insights"""
@@ -20,112 +47,248 @@ class ChatService:
         self.model = "mistralai/mistral-7b-instruct:free"
         self.forecast_data = forecast_data or {}
         self.conversation_history = []
+        # Reused across calls so the TLS connection to OpenRouter is kept alive
+        self.session = requests.Session()
+        # Retries cover failed connects only; urllib3 never replays a POST that reached the server
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://replit.dev",
+            "X-Title": "AI Sales Forecaster"
+        }
+        self.session.headers.update(self._headers)
+        # Created on first async use, inside the event loop that will drive it
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # (forecast_data object, system prompt built from it)
+        self._context_cache: Optional[Tuple[Any, str]] = None
     
-    def _build_context(self) -> str:
-        """Build context from forecast data"""
+    def _build_context(self, forecast_data: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build context from forecast_data (the service's own when None), reused while
+        it is the same object
+        """
+        if forecast_data is None:
+            forecast_data = self.forecast_data
+        cached = self._context_cache
+        if cached is not None and cached[0] is forecast_data:
+            return cached[1]
+        
         context = "You are an AI Sales Forecasting Assistant. "
         
-        if self.forecast_data:
-            if isinstance(self.forecast_data, dict):
-                context += f"Forecast Metrics: {json.dumps(self.forecast_data.get('metrics', {}), default=str)[:500]}. "
+        if forecast_data:
+            if isinstance(forecast_data, dict):
+                context += f"Forecast Metrics: {json.dumps(forecast_data.get('metrics', {}), default=str)[:500]}. "
         
         context += """Help users understand their sales forecasts, identify trends, answer questions about their data, 
 and provide actionable insights. Be concise and focus on business impact.
 When answering questions, reference the provided data and give specific insights. Be concise and actionable."""
         
+        # Holding the object itself (not its id) means a new dict can never match a stale entry
+        self._context_cache = (forecast_data, context)
         return context
     
-    def chat(self, user_message: str, conversation_history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    def _messages(self, user_message: str,
+                  conversation_history: Optional[List[Dict[str, str]]] = None,
+                  forecast_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """System context, the last 10 history messages, then the user's message"""
+        messages = [{
+            "role": "system",
+            "content": self._build_context(forecast_data)
+        }]
+        
+        if conversation_history:
+            for msg in conversation_history[-10:]:  # Last 10 messages
+                messages.append({
+                    "role": msg.get("role", "user"),
+                    "content": msg.get("content", "")
+                })
+        
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        return messages
+    
+    def _payload(self, user_message: str,
+                 conversation_history: Optional[List[Dict[str, str]]] = None,
+                 forecast_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": self._messages(user_message, conversation_history, forecast_data),
+            "temperature": 0.7,
+            "max_tokens": 1024,
+            "stream": True
+        }
+    
+    def _success(self, ai_response: str) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'response': ai_response,
+            'timestamp': datetime.now().isoformat(),
+            'model': self.model,
+            'tokens_used': 0
+        }
+    
+    @staticmethod
+    def _failure(error: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': error,
+            'response': "Sorry, I encountered an error. Please try again."
+        }
+    
+    @staticmethod
+    def _not_configured() -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': "API key not configured",
+            'response': "Sorry, the chat service is not configured. Please contact support."
+        }
+    
+    def chat_stream(self, user_message: str,
+                    conversation_history: Optional[List[Dict[str, str]]] = None,
+                    forecast_data: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Send a message and yield the AI response text as OpenRouter streams it
+        
+        Args:
+            user_message: User's message
+            conversation_history: Previous messages for context
+            forecast_data: Forecast to answer about; defaults to the service's own
+        
+        Yields:
+            Content deltas in arrival order
+        
+        Raises:
+            requests.HTTPError: OpenRouter rejected the request
+            RuntimeError: OpenRouter reported an error mid-stream
+        """
+        payload = self._payload(user_message, conversation_history, forecast_data)
+        
+        # Auth headers live on the session; json= sets Content-Type
+        with self.session.post(self.api_url, json=payload, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
+                raise requests.HTTPError(f"API error: {response.status_code}", response=response)
+            
+            for line in response.iter_lines(decode_unicode=True):
+                content = _sse_content(line)
+                if content is None:
+                    break
+                if content:
+                    yield content
+    
+    def _async_http(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            limits = httpx.Limits(max_connections=HTTP_POOL_MAXSIZE, max_keepalive_connections=HTTP_POOL_MAXSIZE)
+            self._async_client = httpx.AsyncClient(
+                headers=self._headers,
+                timeout=30,
+                # Transport retries cover failed connects only, never a sent request
+                transport=httpx.AsyncHTTPTransport(limits=limits, retries=2)
+            )
+        return self._async_client
+    
+    async def chat_stream_async(self, user_message: str,
+                                conversation_history: Optional[List[Dict[str, str]]] = None,
+                                forecast_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Async counterpart of chat_stream, on a pooled connection shared by concurrent calls
+        
+        Raises:
+            httpx.HTTPStatusError: OpenRouter rejected the request
+            RuntimeError: OpenRouter reported an error mid-stream
+        """
+        payload = self._payload(user_message, conversation_history, forecast_data)
+        
+        async with self._async_http().stream("POST", self.api_url, json=payload) as response:
+            if response.status_code != 200:
+                body = (await response.aread()).decode(errors='replace')
+                logger.error(f"OpenRouter API error: {response.status_code} - {body}")
+                raise httpx.HTTPStatusError(
+                    f"API error: {response.status_code}", request=response.request, response=response
+                )
+            
+            async for line in response.aiter_lines():
+                content = _sse_content(line)
+                if content is None:
+                    break
+                if content:
+                    yield content
+    
+    def chat(self, user_message: str, conversation_history: Optional[List[Dict[str, str]]] = None,
+             forecast_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Send a message and get AI response
         
         Args:
             user_message: User's message
             conversation_history: Previous messages for context
+            forecast_data: Forecast to answer about; defaults to the service's own
         
         Returns:
             Dictionary with response and metadata
         """
         try:
             if not self.api_key:
-                return {
-                    'success': False,
-                    'error': "API key not configured",
-                    'response': "Sorry, the chat service is not configured. Please contact support."
-                }
-            
-            # Build context
-            context = self._build_context()
-            
-            # Prepare messages
-            messages = []
-            
-            # Add system message with context
-            messages.append({
-                "role": "system",
-                "content": context
-            })
-            
-            # Add conversation history if provided
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Last 10 messages
-                    messages.append({
-                        "role": msg.get("role", "user"),
-                        "content": msg.get("content", "")
-                    })
-            
-            # Add current user message
-            messages.append({
-                "role": "user",
-                "content": user_message
-            })
-            
-            # Call OpenRouter API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "HTTP-Referer": "https://replit.dev",
-                "X-Title": "AI Sales Forecaster",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 1024
-            }
-            
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code != 200:
-                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-                return {
-                    'success': False,
-                    'error': f"API error: {response.status_code}",
-                    'response': "Sorry, I encountered an error. Please try again."
-                }
+                return self._not_configured()
             
-            data = response.json()
-            ai_response = data['choices'][0]['message']['content']
+            ai_response = ''.join(self.chat_stream(user_message, conversation_history, forecast_data))
+            return self._success(ai_response)
+        
+        except requests.HTTPError as e:
+            return self._failure(f"API error: {e.response.status_code}")
+        
+        except Exception as e:
+            logger.error(f"Chat error: {str(e)}")
+            return self._failure(f"Failed to get response: {str(e)}")
+    
+    async def chat_async(self, user_message: str,
+                         conversation_history: Optional[List[Dict[str, str]]] = None,
+                         forecast_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a message and get AI response without blocking the event loop
+        
+        Same arguments and result as chat().
+        """
+        try:
+            if not self.api_key:
+                return self._not_configured()
             
-            return {
-                'success': True,
-                'response': ai_response,
-                'timestamp': datetime.now().isoformat(),
-                'model': self.model,
-                'tokens_used': 0
-            }
+            parts = [content async for content in
+                     self.chat_stream_async(user_message, conversation_history, forecast_data)]
+            return self._success(''.join(parts))
+        
+        except httpx.HTTPStatusError as e:
+            return self._failure(f"API error: {e.response.status_code}")
         
         except Exception as e:
             logger.error(f"Chat error: {str(e)}")
-            return {
-                'success': False,
-                'error': f"Failed to get response: {str(e)}",
-                'response': "Sorry, I encountered an error. Please try again."
-            }
+            return self._failure(f"Failed to get response: {str(e)}")
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        self.session.close()
+    
+    async def aclose(self) -> None:
+        """Release the async client's pooled connections"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
     
     def generate_insights_from_query(self, question: str, forecast_data: Dict) -> str:
         """Generate specific insights based on question"""
-        self.forecast_data = forecast_data
-        result = self.chat(question)
+        # Passed per call rather than stored: the service is shared by concurrent requests
+        result = self.chat(question, forecast_data=forecast_data)
         return result.get('response', "Unable to generate insights.")
+    
+    async def generate_insights_from_queries(self, questions: List[str], forecast_data: Dict) -> List[str]:
+        """Answer several questions about the same forecast concurrently"""
+        results = await asyncio.gather(
+            *(self.chat_async(question, forecast_data=forecast_data) for question in questions)
+        )
+        return [result.get('response', "Unable to generate insights.") for result in results]
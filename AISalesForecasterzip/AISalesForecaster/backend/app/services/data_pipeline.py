@@ -1,5 +1,11 @@
+import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from charset_normalizer import from_bytes
+from pandas.tseries.api import guess_datetime_format
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 import logging
@@ -9,6 +15,18 @@ from ..models.schemas import ValidationResult, AggregationType
 
 logger = logging.getLogger(__name__)
 
+# Shallow copies share column buffers until one side writes, so the pipeline can
+# take frames without duplicating them up front
+pd.options.mode.copy_on_write = True
+
+CSV_ENCODINGS = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+CSV_BLOCK_SIZE = 1 << 20
+CSV_SNIFF_BYTES = 64 * 1024
+# Leading rows searched for the first non-null date when guessing its format
+DATE_SNIFF_ROWS = 100
+# Text columns with fewer distinct values than this share of rows become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
 
 class DataPipeline:
     REQUIRED_COLUMNS = ['date']
@@ -16,11 +34,15 @@ class DataPipeline:
     OPTIONAL_COLUMNS = ['product_id', 'product_name', 'region', 'promotion_flag']
     DATE_COLUMN_ALIASES = ['date', 'Date', 'datetime', 'DateTime', 'DATETIME', 'time', 'Time', 'timestamp', 'Timestamp', 'TIMESTAMP']
     
-    def __init__(self, df: pd.DataFrame):
-        self.raw_df = df.copy()
+    def __init__(self, df: pd.DataFrame, copy: bool = False):
+        # Copy-on-write keeps the caller's frame untouched without an eager deep copy
+        self.raw_df = df.copy() if copy else df.copy(deep=False)
         self.processed_df = None
         self.validation_result = None
         self._normalize_columns()
+        # Column names by dtype group, refreshed whenever a method changes column dtypes
+        self._dtype_cache = _dtype_groups(self.raw_df)
+        self._processed_dtype_cache: Optional[Dict[str, List[str]]] = None
     
     def _normalize_columns(self) -> None:
         """Auto-detect and normalize date column names"""
@@ -29,6 +51,7 @@ class DataPipeline:
                 self.raw_df.rename(columns={alias: 'date'}, inplace=True)
                 logger.info(f"Renamed column '{alias}' to 'date'")
                 break
+        self._date_format = guess_date_format(self.raw_df['date']) if 'date' in self.raw_df.columns else None
     
     def validate(self) -> ValidationResult:
         errors = []
@@ -41,7 +64,7 @@ class DataPipeline:
         
         if 'date' in self.raw_df.columns:
             try:
-                self.raw_df['date'] = pd.to_datetime(self.raw_df['date'], infer_datetime_format=True, errors='coerce')
+                self.raw_df['date'] = parse_dates(self.raw_df['date'], self._date_format)
                 invalid_dates = self.raw_df['date'].isna().sum()
                 if invalid_dates > 0:
                     warnings.append(f"{invalid_dates} rows have invalid or missing dates")
@@ -52,7 +75,8 @@ class DataPipeline:
         
         numeric_present = [col for col in self.NUMERIC_COLUMNS if col in self.raw_df.columns]
         if not numeric_present:
-            auto_numeric = self.raw_df.select_dtypes(include=[np.number]).columns.tolist()
+            # Only 'date' has changed dtype since the cache was built
+            auto_numeric = [col for col in self._dtype_cache['number'] if col != 'date']
             if auto_numeric:
                 numeric_present = auto_numeric
                 logger.info(f"Auto-detected numeric columns: {numeric_present}")
@@ -64,6 +88,7 @@ class DataPipeline:
                 self.raw_df[col] = pd.to_numeric(self.raw_df[col], errors='coerce')
             except Exception:
                 pass
+        self._dtype_cache = _dtype_groups(self.raw_df)
         
         missing_values = {}
         for col in self.raw_df.columns:
@@ -103,24 +128,28 @@ class DataPipeline:
         return self.validation_result
     
     def clean_data(self) -> pd.DataFrame:
-        df = self.raw_df.copy()
+        # Only the columns written below get copied
+        df = self.raw_df.copy(deep=False)
         
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            df['date'] = parse_dates(df['date'], self._date_format)
             df = df.dropna(subset=['date'])
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        for col in numeric_cols:
-            median_val = df[col].median()
-            df[col] = df[col].fillna(median_val)
-        
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-        if 'date' in categorical_cols:
-            categorical_cols.remove('date')
-        for col in categorical_cols:
-            mode_val = df[col].mode()
-            if len(mode_val) > 0:
-                df[col] = df[col].fillna(mode_val[0])
+        # One block fill per dtype group instead of a fillna/assign round trip per column
+        # Fills keep every column's dtype group, so handle_outliers can reuse these
+        self._processed_dtype_cache = _dtype_groups(df)
+        numeric_cols = self._processed_dtype_cache['number']
+        if numeric_cols:
+            df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
+        
+        categorical_cols = [col for col in self._processed_dtype_cache['categorical'] if col != 'date']
+        if categorical_cols:
+            modes = df[categorical_cols].mode()
+            if len(modes) > 0:
+                # Entirely missing columns have no mode and are left untouched
+                fill_values = modes.iloc[0].dropna()
+                fill_cols = fill_values.index.tolist()
+                df[fill_cols] = df[fill_cols].fillna(fill_values)
         
         self.processed_df = df
         return df
@@ -132,17 +161,19 @@ class DataPipeline:
         df = self.processed_df.copy()
         
         if columns is None:
-            columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        
-        for col in columns:
-            if col in df.columns:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
+            columns = self._processed_dtype_cache['number']
+        
+        columns = [col for col in columns if col in df.columns]
+        if columns:
+            # Both quartiles of every column in one pass, then one clip over the block
+            quartiles = df[columns].quantile([0.25, 0.75])
+            Q1 = quartiles.loc[0.25]
+            Q3 = quartiles.loc[0.75]
+            IQR = Q3 - Q1
+            lower_bound = Q1 - 1.5 * IQR
+            upper_bound = Q3 + 1.5 * IQR
+            
+            df[columns] = df[columns].clip(lower=lower_bound, upper=upper_bound, axis=1)
         
         self.processed_df = df
         return df
@@ -152,8 +183,7 @@ class DataPipeline:
         if self.processed_df is None:
             self.clean_data()
         
-        df = self.processed_df.copy()
-        df = df.sort_values('date')
+        df = self.processed_df
         
         freq_map = {
             AggregationType.DAILY: 'D',
@@ -171,64 +201,76 @@ class DataPipeline:
         if 'promotion_flag' in df.columns:
             agg_cols['promotion_flag'] = 'max'
         
-        if group_by and group_by in df.columns:
-            df['period'] = df['date'].dt.to_period(pd_freq)
-            aggregated = df.groupby(['period', group_by]).agg(agg_cols).reset_index()
-            aggregated['date'] = aggregated['period'].dt.to_timestamp()
+        grouped = bool(group_by) and group_by in df.columns
+        # Sort only the columns the aggregation reads; the row order (and so every
+        # float sum) is the same as sorting the whole frame
+        columns = list(dict.fromkeys(['date', *agg_cols, *([group_by] if grouped else [])]))
+        df = df[columns].sort_values('date')
+        
+        if grouped:
+            # Periods keyed by their first day number: one datetime64 pass instead of
+            # building Period objects and converting them back to timestamps
+            df['period'] = period_start_days(day_numbers(df['date']), pd_freq)
+            aggregated = df.groupby(['period', group_by], observed=True).agg(agg_cols).reset_index()
+            # Uploads store repetitive text as categoricals; features expect plain values
+            if isinstance(aggregated[group_by].dtype, pd.CategoricalDtype):
+                aggregated[group_by] = aggregated[group_by].astype(object)
+            aggregated['date'] = aggregated['period'].to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
             aggregated = aggregated.drop(columns=['period'])
         else:
-            df.set_index('date', inplace=True)
-            aggregated = df.resample(pd_freq).agg(agg_cols).reset_index()
+            aggregated = df.resample(pd_freq, on='date').agg(agg_cols).reset_index()
         
         return aggregated
     
     def engineer_features(self, df: pd.DataFrame, target_column: str = 'revenue') -> pd.DataFrame:
-        df = df.copy()
+        # sort_values already returns a new frame; features are collected and joined once
         df = df.sort_values('date')
+        features = calendar_fields(df['date'])
         
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day'] = df['date'].dt.day
-        df['day_of_week'] = df['date'].dt.dayofweek
-        df['week_of_year'] = df['date'].dt.isocalendar().week.astype(int)
-        df['quarter'] = df['date'].dt.quarter
-        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
-        df['is_month_start'] = df['date'].dt.is_month_start.astype(int)
-        df['is_month_end'] = df['date'].dt.is_month_end.astype(int)
-        
+        target = df[target_column]
         for lag in [1, 7, 14, 30]:
-            df[f'{target_column}_lag_{lag}'] = df[target_column].shift(lag)
+            features[f'{target_column}_lag_{lag}'] = target.shift(lag)
         
         for window in [7, 14, 30]:
-            df[f'{target_column}_rolling_mean_{window}'] = df[target_column].rolling(window=window, min_periods=1).mean()
-            df[f'{target_column}_rolling_std_{window}'] = df[target_column].rolling(window=window, min_periods=1).std()
-        
-        df[f'{target_column}_diff'] = df[target_column].diff()
-        df[f'{target_column}_pct_change'] = df[target_column].pct_change()
+            # Mean and std share one Rolling object and its window bounds
+            rolling = target.rolling(window=window, min_periods=1)
+            features[f'{target_column}_rolling_mean_{window}'] = rolling.mean()
+            features[f'{target_column}_rolling_std_{window}'] = rolling.std()
+        
+        (features[f'{target_column}_diff'],
+         features[f'{target_column}_pct_change']) = _diff_and_pct_change(
+            target.to_numpy(dtype=np.float64, na_value=np.nan)
+        )
         
         if 'price' in df.columns and 'units_sold' in df.columns:
-            df['price_lag_1'] = df['price'].shift(1)
-            df['units_lag_1'] = df['units_sold'].shift(1)
+            features['price_lag_1'] = df['price'].shift(1)
+            features['units_lag_1'] = df['units_sold'].shift(1)
             
-            price_change = df['price'].pct_change()
-            units_change = df['units_sold'].pct_change()
-            
-            with np.errstate(divide='ignore', invalid='ignore'):
-                df['price_elasticity'] = np.where(
-                    price_change != 0,
-                    units_change / price_change,
-                    0
-                )
-            df['price_elasticity'] = df['price_elasticity'].replace([np.inf, -np.inf], 0).fillna(0)
+            features['price_elasticity'] = _price_elasticity(
+                df['price'].ffill().to_numpy(dtype=np.float64, na_value=np.nan),
+                df['units_sold'].ffill().to_numpy(dtype=np.float64, na_value=np.nan)
+            )
         
         try:
-            holiday_flags = get_holiday_flags(df['date'])
-            df = pd.concat([df.reset_index(drop=True), holiday_flags.reset_index(drop=True)], axis=1)
+            holiday_flags = get_holiday_flags(df['date']).reset_index(drop=True)
         except Exception as e:
             logger.warning(f"Could not add holiday flags: {e}")
-            df['is_holiday'] = 0
-        
-        df = df.fillna(method='bfill').fillna(method='ffill').fillna(0)
+            holiday_flags = pd.DataFrame({'is_holiday': np.zeros(len(df), dtype=np.int8)})
+        
+        # Recomputed features replace same-named input columns, as assignment did
+        features = pd.DataFrame(features, index=df.index).reset_index(drop=True)
+        df = df.drop(columns=[col for col in features if col in df.columns]).reset_index(drop=True)
+        df = pd.concat([df, features, holiday_flags], axis=1)
+        
+        # Backfill, then forward-fill what is left, then zero: the float block in one
+        # NumPy pass, any other column with gaps through pandas
+        float_cols = df.select_dtypes(include=[np.floating]).columns
+        df[float_cols] = _fill_gaps(df[float_cols].to_numpy(dtype=np.float64))
+        other_cols = df.columns.difference(float_cols, sort=False)
+        gaps = df[other_cols].isna().any()
+        if gaps.any():
+            gap_cols = gaps.index[gaps]
+            df[gap_cols] = df[gap_cols].bfill().ffill().fillna(0)
         
         return df
     
@@ -243,18 +285,23 @@ class DataPipeline:
         return featured
     
     def get_preview(self, n: int = 10) -> List[Dict[str, Any]]:
-        df = self.raw_df.head(n).copy()
+        head = self.raw_df.head(n)
         
-        for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].dt.strftime('%Y-%m-%d')
+        formatted = {
+            col: iso_dates(head[col])
+            for col in head.columns
+            if pd.api.types.is_datetime64_any_dtype(head[col])
+        }
+        if formatted:
+            # assign() builds a new frame; raw_df is left untouched
+            head = head.assign(**formatted)
         
-        return df.to_dict(orient='records')
+        return head.to_dict(orient='records')
     
     def get_column_info(self) -> Tuple[List[str], List[str], List[str]]:
         all_columns = list(self.raw_df.columns)
-        numeric_columns = list(self.raw_df.select_dtypes(include=[np.number]).columns)
-        categorical_columns = list(self.raw_df.select_dtypes(include=['object', 'category']).columns)
+        numeric_columns = list(self._dtype_cache['number'])
+        categorical_columns = list(self._dtype_cache['categorical'])
         
         return all_columns, numeric_columns, categorical_columns
     
@@ -263,7 +310,301 @@ class DataPipeline:
         if group_col not in df.columns or value_col not in df.columns:
             return []
         
-        grouped = df.groupby(group_col)[value_col].sum().reset_index()
+        grouped = df.groupby(group_col, observed=True)[value_col].sum().reset_index()
         grouped = grouped.sort_values(value_col, ascending=False).head(n)
         
         return grouped.to_dict(orient='records')
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    # Howard Hinnant's days_from_civil, vectorised; proleptic Gregorian, day 0 = 1970-01-01
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Howard Hinnant's civil_from_days, vectorised: the inverse of _days_from_civil
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def _dtype_groups(df: pd.DataFrame) -> Dict[str, List[str]]:
+    """Numeric and categorical (object or category) column names of a frame"""
+    return {
+        'number': df.select_dtypes(include=[np.number]).columns.tolist(),
+        'categorical': df.select_dtypes(include=['object', 'category']).columns.tolist()
+    }
+
+
+def _pct_change(values: np.ndarray) -> np.ndarray:
+    # Same arithmetic as Series.pct_change on forward-filled values: x[i] / x[i-1] - 1
+    change = np.full_like(values, np.nan)
+    np.divide(values[1:], values[:-1], out=change[1:])
+    change[1:] -= 1
+    return change
+
+
+def _diff_and_pct_change(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Series.diff() and Series.pct_change() of one float array, from a single conversion"""
+    diff = np.full_like(values, np.nan)
+    np.subtract(values[1:], values[:-1], out=diff[1:])
+    
+    missing = np.isnan(values)
+    if missing.any():
+        # pct_change works on forward-filled values
+        last_valid = np.maximum.accumulate(np.where(missing, 0, np.arange(len(values))))
+        values = values[last_valid]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return diff, _pct_change(values)
+
+
+def _price_elasticity(price: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """Period-over-period units change per unit of price change; 0 where undefined"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = _pct_change(price)
+        elasticity = _pct_change(units)
+        np.divide(elasticity, price_change, out=elasticity, where=price_change != 0)
+    elasticity[(price_change == 0) | ~np.isfinite(elasticity)] = 0
+    return elasticity
+
+
+def _fill_gaps(values: np.ndarray) -> np.ndarray:
+    """
+    Fill NaNs in each column of a 2-D float array: from the next valid row, else
+    the previous one, else 0 (bfill, then ffill, then fillna(0))
+    
+    The input is never written to; under copy-on-write it can be a read-only view
+    of the frame. A new array is returned when anything was filled.
+    """
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    
+    n = len(values)
+    rows = np.arange(n)[:, None]
+    next_valid = np.minimum.accumulate(np.where(missing, n, rows)[::-1], axis=0)[::-1]
+    prev_valid = np.maximum.accumulate(np.where(missing, -1, rows), axis=0)
+    source = np.where(next_valid < n, next_valid, prev_valid)
+    
+    # Valid cells are their own source, so the gather is already the filled copy
+    filled = values[np.maximum(source, 0), np.arange(values.shape[1])]
+    filled[source < 0] = 0
+    return filled
+
+
+def day_numbers(dates: pd.Series) -> np.ndarray:
+    """Local calendar day of each datetime as int64 days since 1970-01-01"""
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy().astype('datetime64[D]').view(np.int64)
+
+
+def iso_dates(dates: pd.Series) -> np.ndarray:
+    """YYYY-MM-DD strings for a datetime series (local calendar date), NaN for NaT"""
+    days = day_numbers(dates).astype('datetime64[D]')
+    text = np.datetime_as_string(days).astype(object)
+    text[np.isnat(days)] = np.nan
+    return text
+
+
+def period_start_days(days: np.ndarray, freq: str) -> np.ndarray:
+    """
+    First day of the 'D', 'W' (Monday-based, as pandas 'W' periods) or 'M'
+    period containing each day number
+    """
+    if freq == 'W':
+        return days - (days + 3) % 7
+    if freq == 'M':
+        year, month, _ = _civil_from_days(days)
+        return _days_from_civil(year, month, np.ones_like(month))
+    return days
+
+
+def calendar_fields(dates: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Calendar feature columns for a datetime series, derived from its day numbers
+    
+    Integer arithmetic over one int64 array replaces a separate pandas accessor
+    pass per field; flags and small fields come back as int8, the year as int16.
+    """
+    days = day_numbers(dates)
+    
+    year, month, day = _civil_from_days(days)
+    day_of_week = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday = 0
+    
+    # ISO week: the week belongs to the year of its Thursday
+    thursday = days - day_of_week + 3
+    iso_year = _civil_from_days(thursday)[0]
+    week_of_year = (thursday - _days_from_civil(iso_year, np.ones_like(iso_year), np.ones_like(iso_year))) // 7 + 1
+    
+    return {
+        'year': year.astype(np.int16),
+        'month': month.astype(np.int8),
+        'day': day.astype(np.int8),
+        'day_of_week': day_of_week.astype(np.int8),
+        'week_of_year': week_of_year.astype(np.int8),
+        'quarter': ((month - 1) // 3 + 1).astype(np.int8),
+        'is_weekend': (day_of_week >= 5).astype(np.int8),
+        'is_month_start': (day == 1).astype(np.int8),
+        'is_month_end': (_civil_from_days(days + 1)[2] == 1).astype(np.int8)
+    }
+
+
+def sidecar_path(file_path: str) -> str:
+    """Parquet copy of an uploaded CSV, stored next to it"""
+    return os.path.splitext(file_path)[0] + '.parquet'
+
+
+def remove_upload(file_path: str) -> None:
+    """Delete an uploaded CSV and its Parquet sidecar; either may already be gone"""
+    for path in (file_path, sidecar_path(file_path)):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink a parsed upload in place: smallest integer types, categoricals for repetitive text"""
+    before = df.memory_usage(deep=True).sum()
+    
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    # Floats stay float64: float32 would change the sums and means the models see
+    for col in df.select_dtypes(include='object').columns:
+        if col in DataPipeline.DATE_COLUMN_ALIASES:
+            continue
+        if df[col].nunique() < len(df) * CATEGORY_MAX_RATIO:
+            df[col] = df[col].astype('category')
+    
+    after = df.memory_usage(deep=True).sum()
+    logger.info("Compacted upload from %d to %d bytes", before, after)
+    return df
+
+
+def guess_date_format(values: pd.Series) -> Optional[str]:
+    """
+    strftime format of a text date column, guessed from its first non-null value
+    the same way pandas infers it; None for non-text columns or unrecognised text
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return None
+    sample = values.head(DATE_SNIFF_ROWS).dropna()
+    if sample.empty or not isinstance(sample.iloc[0], str):
+        return None
+    return guess_datetime_format(sample.iloc[0])
+
+
+def parse_dates(values: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+    """
+    Dates as datetime64, NaT where unparseable; already-parsed columns pass through
+    
+    An explicit format sends every row down pandas' strptime path with no per-call
+    inference, and cache=True parses each distinct string once.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if date_format is None:
+        date_format = guess_date_format(values)
+    return pd.to_datetime(values, format=date_format, errors='coerce', cache=True)
+
+
+def add_calendar_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse 'date' and derive 'month' in place, unless the frame already has them"""
+    if 'date' not in df.columns:
+        return df
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = parse_dates(df['date'])
+    if 'month' not in df.columns:
+        month = df['date'].dt.month
+        df['month'] = month.astype(np.int8) if month.notna().all() else month
+    return df
+
+
+def save_sidecar(df: pd.DataFrame, file_path: str) -> Optional[str]:
+    """Persist the parsed upload as Parquet so later requests skip CSV parsing"""
+    path = sidecar_path(file_path)
+    # Stored with a parsed date and its month so readers don't redo that per request;
+    # the shallow copy leaves the caller's frame (and the upload preview) as parsed
+    df = add_calendar_columns(df.copy(deep=False))
+    try:
+        df.to_parquet(path, engine='pyarrow', compression='snappy', index=False)
+    except Exception as e:
+        # e.g. object columns mixing numbers and text; readers fall back to the CSV
+        logger.warning("Could not write Parquet sidecar for %s: %s", file_path, e)
+        if os.path.exists(path):
+            os.unlink(path)
+        return None
+    return path
+
+
+def _arrow_read_csv(file_path: str, encoding: str) -> pa.Table:
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE, encoding=encoding)
+    # Empty and NA-like fields are missing in text columns too, as pd.read_csv treats them
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    # Memory-mapped, so the parser reads straight from the page cache
+    with pa.memory_map(file_path) as source:
+        return pacsv.read_csv(source, read_options=read_options, convert_options=convert_options)
+
+
+def read_csv_file(file_path: str) -> pd.DataFrame:
+    """Parse a CSV file with Arrow's multithreaded reader; the encoding is only sniffed if UTF-8 fails"""
+    table = _arrow_read_csv(file_path, 'utf8')
+    # Arrow doesn't raise on bad UTF-8, it types the affected columns as binary
+    if any(pa.types.is_binary(field.type) for field in table.schema):
+        with open(file_path, 'rb') as f:
+            head = f.read(CSV_SNIFF_BYTES)
+        match = from_bytes(head, cp_isolation=CSV_ENCODINGS[2:]).best()
+        encoding = match.encoding if match else 'latin-1'
+        logger.info("CSV is not UTF-8, re-reading as %s", encoding)
+        table = _arrow_read_csv(file_path, encoding)
+    # Plain NumPy-backed columns, with ISO date columns as datetime64
+    return table.to_pandas(date_as_object=False)
+
+
+def read_csv_any_encoding(file_path: str) -> Optional[pd.DataFrame]:
+    for encoding in CSV_ENCODINGS:
+        try:
+            df = pd.read_csv(file_path, encoding=encoding)
+            logger.info("Successfully parsed CSV with encoding: %s", encoding)
+            return df
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def load_job_frame(file_path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Load an uploaded dataset, reading only `columns` (those that exist) when given
+    
+    'date' comes back parsed, with 'month' alongside when asked for; only sidecars
+    written before those were stored, and uploads without a sidecar, pay for
+    deriving them here
+    """
+    wants_month = columns is None or 'month' in columns
+    path = sidecar_path(file_path)
+    if os.path.exists(path):
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in dict.fromkeys(columns) if col in available]
+        df = pd.read_parquet(path, engine='pyarrow', columns=columns)
+    else:
+        df = read_csv_any_encoding(file_path)
+        if df is not None and columns is not None:
+            df = df[[col for col in dict.fromkeys(columns) if col in df.columns]]
+    if df is not None and wants_month:
+        add_calendar_columns(df)
+    return df
@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 import logging
 import warnings
+from functools import lru_cache
 
 from prophet import Prophet
 from sklearn.model_selection import train_test_split
@@ -17,10 +18,69 @@ from ..models.schemas import (
     ForecastPoint, DecompositionData, FeatureImportance
 )
 from .bias_detector import BiasDetector
+from .data_pipeline import calendar_fields, iso_dates
 
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
+# Below this many training rows, shipping the data to a GPU costs more than
+# building the histograms on the CPU
+LIGHTGBM_GPU_MIN_ROWS = 50_000
+
+
+def _finite(values) -> np.ndarray:
+    """Float array with NaN and +/-inf replaced by 0.0, so points are JSON-safe when built"""
+    return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _finite_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    present = [c for c in columns if c in df.columns]
+    df[present] = _finite(df[present].to_numpy())
+    return df
+
+
+def _rounded(values, floor_zero: bool = False) -> List[float]:
+    """Values rounded to cents as Python floats, optionally floored at 0.0"""
+    rounded = np.round(np.asarray(values, dtype=np.float64), 2)
+    if floor_zero:
+        rounded = np.where(rounded > 0, rounded, 0.0)
+    return rounded.tolist()
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first; equal values keep their
+    original order, as a stable descending sort would
+    """
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    threshold = np.partition(values, -k)[-k]
+    above = np.flatnonzero(values > threshold)
+    tied = np.flatnonzero(values == threshold)[:k - len(above)]
+    top = np.concatenate([above, tied])
+    top.sort()
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def _forecast_points(dates: pd.Series, predicted, lower, upper,
+                     actuals=None) -> List[ForecastPoint]:
+    """
+    ForecastPoints from whole columns, rounded to cents in one pass each;
+    predicted and lower bounds are floored at 0.0
+    """
+    columns = {
+        'date': iso_dates(dates).tolist(),
+        'predicted': _rounded(predicted, floor_zero=True),
+        'lower_bound': _rounded(lower, floor_zero=True),
+        'upper_bound': _rounded(upper)
+    }
+    if actuals is not None:
+        columns['actual'] = _rounded(actuals)
+    
+    names = list(columns)
+    return [ForecastPoint(**dict(zip(names, row))) for row in zip(*columns.values())]
+
 
 def _import_lightgbm():
     """Lazy import LightGBM to avoid system library loading at module init"""
@@ -35,9 +95,26 @@ def _import_lightgbm():
     return lgb
 
 
+@lru_cache(maxsize=1)
+def _lightgbm_device() -> str:
+    """'cuda' if this LightGBM build can train on a GPU here, else 'cpu'; probed once per process"""
+    _import_lightgbm()
+    try:
+        probe = lgb.Dataset(np.zeros((8, 2)), label=np.zeros(8))
+        lgb.train({'objective': 'regression', 'device': 'cuda', 'verbose': -1}, probe, num_boost_round=1)
+    except Exception as e:
+        logger.info("LightGBM will train on the CPU: %s", e)
+        return 'cpu'
+    logger.info("LightGBM will train large datasets on the GPU")
+    return 'cuda'
+
+
 class Forecaster:
     def __init__(self, df: pd.DataFrame, target_column: str = 'revenue'):
-        self.df = df.copy()
+        # Shallow: copy-on-write (enabled by data_pipeline) shares the caller's columns
+        self.df = df.copy(deep=False)
+        # Integer and float columns in frame order, the LightGBM feature candidates
+        self._numeric_cols = self.df.select_dtypes(include=['integer', 'floating'], exclude='timedelta').columns
         self.target_column = target_column
         self.model = None
         self.model_type = None
@@ -90,7 +167,7 @@ class Forecaster:
                       aggregation: AggregationType = AggregationType.MONTHLY) -> Dict[str, Any]:
         self.model_type = ModelType.PROPHET
         
-        prophet_df = self.df[['date', self.target_column]].copy()
+        prophet_df = self.df[['date', self.target_column]]
         prophet_df.columns = ['ds', 'y']
         prophet_df = prophet_df.dropna()
         
@@ -118,41 +195,41 @@ class Forecaster:
             warnings.simplefilter("ignore")
             self.model.fit(train_df)
         
-        test_forecast = self.model.predict(test_df[['ds']])
-        self.metrics = self._calculate_metrics(
-            test_df['y'].values, 
-            test_forecast['yhat'].values
-        )
-        
         future_dates = self._get_forecast_periods(horizon, aggregation, prophet_df['ds'].max())
         future_df = pd.DataFrame({'ds': future_dates})
+        history_df = prophet_df[['ds']]
         
         if 'promotion_flag' in self.df.columns:
+            promotions = self.df.drop_duplicates('date').set_index('date')['promotion_flag']
+            history_df = history_df.assign(promotion_flag=history_df['ds'].map(promotions).fillna(0))
             future_df['promotion_flag'] = 0
         
-        forecast = self.model.predict(future_df)
-        
-        forecast_points = []
-        for _, row in forecast.iterrows():
-            forecast_points.append(ForecastPoint(
-                date=row['ds'].strftime('%Y-%m-%d'),
-                predicted=max(0, round(row['yhat'], 2)),
-                lower_bound=max(0, round(row['yhat_lower'], 2)),
-                upper_bound=round(row['yhat_upper'], 2)
-            ))
-        
-        historical_points = []
-        historical_forecast = self.model.predict(prophet_df[['ds']])
-        for (_, row), (_, hist_row) in zip(prophet_df.iterrows(), historical_forecast.iterrows()):
-            historical_points.append(ForecastPoint(
-                date=row['ds'].strftime('%Y-%m-%d'),
-                actual=round(row['y'], 2),
-                predicted=max(0, round(hist_row['yhat'], 2)),
-                lower_bound=max(0, round(hist_row['yhat_lower'], 2)),
-                upper_bound=round(hist_row['yhat_upper'], 2)
-            ))
-        
-        decomposition = self._extract_prophet_decomposition(prophet_df)
+        # One predict covers the test window, the history and the horizon. Prophet
+        # returns rows sorted by ds and every future date follows the history, so
+        # the first len(prophet_df) rows are the (date-sorted) history.
+        prediction = self.model.predict(pd.concat([history_df, future_df], ignore_index=True))
+        n_history = len(prophet_df)
+        
+        self.metrics = self._calculate_metrics(
+            test_df['y'].values, 
+            prediction['yhat'].to_numpy()[train_size:n_history]
+        )
+        
+        prediction = _finite_columns(
+            prediction, ['yhat', 'yhat_lower', 'yhat_upper', 'trend', 'yearly', 'weekly']
+        )
+        historical_forecast = prediction.iloc[:n_history]
+        forecast = prediction.iloc[n_history:]
+        
+        forecast_points = _forecast_points(
+            forecast['ds'], forecast['yhat'], forecast['yhat_lower'], forecast['yhat_upper']
+        )
+        historical_points = _forecast_points(
+            prophet_df['ds'], historical_forecast['yhat'], historical_forecast['yhat_lower'],
+            historical_forecast['yhat_upper'], actuals=prophet_df['y']
+        )
+        
+        decomposition = self._extract_prophet_decomposition(prophet_df, historical_forecast)
         
         return {
             'forecast': forecast_points,
@@ -162,37 +239,20 @@ class Forecaster:
             'feature_importance': None
         }
     
-    def _extract_prophet_decomposition(self, df: pd.DataFrame) -> DecompositionData:
-        forecast = self.model.predict(df[['ds']])
-        
-        trend_data = []
-        seasonal_data = []
-        residual_data = []
-        
-        for idx, row in forecast.iterrows():
-            date_str = row['ds'].strftime('%Y-%m-%d')
-            actual = df.iloc[idx]['y'] if idx < len(df) else None
-            
-            trend_data.append({
-                'date': date_str,
-                'value': round(row['trend'], 2)
-            })
-            
-            yearly_seasonal = row.get('yearly', 0)
-            weekly_seasonal = row.get('weekly', 0) if 'weekly' in row else 0
-            total_seasonal = yearly_seasonal + weekly_seasonal
-            
-            seasonal_data.append({
-                'date': date_str,
-                'value': round(total_seasonal, 2)
-            })
-            
-            if actual is not None:
-                residual = actual - row['yhat']
-                residual_data.append({
-                    'date': date_str,
-                    'value': round(residual, 2)
-                })
+    def _extract_prophet_decomposition(self, df: pd.DataFrame, forecast: pd.DataFrame) -> DecompositionData:
+        """Trend, seasonal and residual series from the (finite) Prophet prediction over df's dates"""
+        dates = iso_dates(forecast['ds']).tolist()
+        # Summed over plain arrays; a model without either component still gets a zero series
+        seasonal = np.zeros(len(forecast))
+        for component in ('yearly', 'weekly'):
+            if component in forecast.columns:
+                seasonal += forecast[component].to_numpy()
+        # Forecast rows line up with df by position, not by df's (post-dropna) index
+        residual = df['y'].to_numpy(dtype=np.float64) - forecast['yhat'].to_numpy()
+        
+        trend_data = [{'date': d, 'value': v} for d, v in zip(dates, _rounded(forecast['trend']))]
+        seasonal_data = [{'date': d, 'value': v} for d, v in zip(dates, _rounded(seasonal))]
+        residual_data = [{'date': d, 'value': v} for d, v in zip(dates, _rounded(residual))]
         
         return DecompositionData(
             trend=trend_data,
@@ -214,20 +274,11 @@ class Forecaster:
         
         self.model_type = ModelType.LIGHTGBM
         
-        df = self.df.copy()
-        df = df.sort_values('date')
+        df = self.df.sort_values('date')
         
-        exclude_cols = ['date', self.target_column, 'holiday_name']
-        if 'product_id' in df.columns:
-            exclude_cols.append('product_id')
-        if 'product_name' in df.columns:
-            exclude_cols.append('product_name')
-        if 'region' in df.columns:
-            exclude_cols.append('region')
-        
-        feature_cols = [col for col in df.columns 
-                       if col not in exclude_cols 
-                       and df[col].dtype in ['int64', 'float64', 'int32', 'float32']]
+        exclude_cols = ['date', self.target_column, 'holiday_name', 'product_id', 'product_name', 'region']
+        # Column order is kept: it is the model's feature order and breaks importance ties
+        feature_cols = self._numeric_cols.difference(exclude_cols, sort=False).tolist()
         
         X = df[feature_cols].fillna(0)
         y = df[self.target_column].fillna(0)
@@ -246,61 +297,52 @@ class Forecaster:
             'bagging_fraction': 0.8,
             'bagging_freq': 5,
             'verbose': -1,
-            'n_estimators': 100
+            'num_iterations': 100
         }
+        if len(X_train) >= LIGHTGBM_GPU_MIN_ROWS:
+            params['device'] = _lightgbm_device()
         
-        self.model = lgb.LGBMRegressor(**params)
-        self.model.fit(X_train, y_train, eval_set=[(X_test, y_test)])
+        # Native booster: one Dataset conversion and no sklearn input validation on
+        # each predict. Nothing reads per-iteration validation scores (no early
+        # stopping), so no valid set is evaluated during training.
+        self.model = lgb.train(params, lgb.Dataset(X_train, label=y_train))
         
         y_pred = self.model.predict(X_test)
-        y_pred = np.array([self._clean_nan_inf(v) for v in y_pred])
+        y_pred = _finite(y_pred)
         self.metrics = self._calculate_metrics(y_test.values, y_pred)
         
-        importances = self.model.feature_importances_
+        importances = _finite(self.model.feature_importance(importance_type='split'))
         importance_sum = float(np.sum(importances)) if np.sum(importances) > 0 else 1.0
         self.feature_importance = [
             FeatureImportance(
-                feature=feat, 
-                importance=round(self._clean_nan_inf(imp) / importance_sum * 100, 2)
+                feature=feature_cols[i], 
+                importance=round(importances[i] / importance_sum * 100, 2)
             )
-            for feat, imp in sorted(zip(feature_cols, importances), 
-                                   key=lambda x: x[1], reverse=True)[:10]
+            for i in _top_k(importances, 10)
         ]
         
         last_date = df['date'].max()
         future_dates = self._get_forecast_periods(horizon, aggregation, last_date)
         
-        last_row = df.iloc[-1].copy()
-        forecast_points = []
-        
-        for future_date in future_dates:
-            future_features = self._create_future_features(last_row, future_date, feature_cols)
-            prediction = max(0, self.model.predict([future_features])[0])
-            prediction = self._clean_nan_inf(prediction)
-            
-            std_dev = self._clean_nan_inf(np.std(y) * 0.1)
-            forecast_points.append(ForecastPoint(
-                date=future_date.strftime('%Y-%m-%d'),
-                predicted=round(prediction, 2),
-                lower_bound=max(0, round(prediction - 1.96 * std_dev, 2)),
-                upper_bound=round(prediction + 1.96 * std_dev, 2)
-            ))
-            
-            last_row[self.target_column] = prediction
-        
-        historical_points = []
-        y_hist_pred = self.model.predict(X)
-        y_hist_pred = np.array([self._clean_nan_inf(v) for v in y_hist_pred])
-        
-        for idx, (_, row) in enumerate(df.iterrows()):
-            std_dev = self._clean_nan_inf(np.std(y) * 0.1)
-            historical_points.append(ForecastPoint(
-                date=row['date'].strftime('%Y-%m-%d'),
-                actual=round(row[self.target_column], 2),
-                predicted=max(0, round(y_hist_pred[idx], 2)),
-                lower_bound=max(0, round(y_hist_pred[idx] - 1.96 * std_dev, 2)),
-                upper_bound=round(y_hist_pred[idx] + 1.96 * std_dev, 2)
-            ))
+        # The target is never a feature, so no step depends on the previous
+        # prediction and the whole horizon is predicted in one batch
+        future_features = self._create_future_features(df.iloc[-1], future_dates, feature_cols)
+        predictions = self.model.predict(future_features)
+        predictions = _finite(np.where(predictions > 0, predictions, 0.0))
+        
+        std_dev = self._clean_nan_inf(np.std(y) * 0.1)
+        forecast_points = _forecast_points(
+            pd.Series(future_dates), predictions,
+            predictions - 1.96 * std_dev, predictions + 1.96 * std_dev
+        )
+        
+        y_hist_pred = _finite(self.model.predict(X))
+        actuals = _finite(df[self.target_column].to_numpy(dtype=np.float64, na_value=np.nan))
+        
+        historical_points = _forecast_points(
+            df['date'], y_hist_pred,
+            y_hist_pred - 1.96 * std_dev, y_hist_pred + 1.96 * std_dev, actuals=actuals
+        )
         
         return {
             'forecast': forecast_points,
@@ -310,34 +352,21 @@ class Forecaster:
             'feature_importance': self.feature_importance
         }
     
-    def _create_future_features(self, last_row: pd.Series, 
-                                future_date: pd.Timestamp,
-                                feature_cols: List[str]) -> List[float]:
-        features = []
-        
-        for col in feature_cols:
-            if col == 'year':
-                features.append(future_date.year)
-            elif col == 'month':
-                features.append(future_date.month)
-            elif col == 'day':
-                features.append(future_date.day)
-            elif col == 'day_of_week':
-                features.append(future_date.dayofweek)
-            elif col == 'week_of_year':
-                features.append(future_date.isocalendar()[1])
-            elif col == 'quarter':
-                features.append((future_date.month - 1) // 3 + 1)
-            elif col == 'is_weekend':
-                features.append(1 if future_date.dayofweek >= 5 else 0)
-            elif col == 'is_month_start':
-                features.append(1 if future_date.day == 1 else 0)
-            elif col == 'is_month_end':
-                features.append(1 if future_date.day == future_date.days_in_month else 0)
-            elif col in last_row:
-                features.append(float(last_row[col]) if pd.notna(last_row[col]) else 0)
-            else:
-                features.append(0)
+    def _create_future_features(self, last_row: pd.Series,
+                                future_dates: pd.DatetimeIndex,
+                                feature_cols: List[str]) -> np.ndarray:
+        """
+        (len(future_dates), len(feature_cols)) matrix: calendar features from the
+        future dates, every other feature carried over from last_row (0 if missing)
+        """
+        calendar = calendar_fields(pd.Series(future_dates))
+        features = np.zeros((len(future_dates), len(feature_cols)), dtype=np.float64)
+        
+        for i, col in enumerate(feature_cols):
+            if col in calendar:
+                features[:, i] = calendar[col]
+            elif col in last_row and pd.notna(last_row[col]):
+                features[:, i] = float(last_row[col])
         
         return features
     
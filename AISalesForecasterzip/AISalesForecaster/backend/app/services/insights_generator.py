@@ -1,9 +1,12 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import cached_property
 import logging
 
+from pydantic import TypeAdapter
+
 from ..models.schemas import (
     InsightBullet, Recommendation, KPISnapshot,
     ForecastMetrics, FeatureImportance
@@ -12,17 +15,70 @@ from ..utils.helpers import format_number, format_percentage, calculate_change_p
 
 logger = logging.getLogger(__name__)
 
+MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December')
+MONTH_ABBREVIATIONS = tuple(name[:3] for name in MONTH_NAMES)
+
+# Each section is dumped to plain dicts in one pydantic-core call rather than per item
+_KPI_LIST = TypeAdapter(List[KPISnapshot])
+_BULLET_LIST = TypeAdapter(List[InsightBullet])
+_RECOMMENDATION_LIST = TypeAdapter(List[Recommendation])
+
+
+def _trend_slope(values: np.ndarray) -> float:
+    """Least-squares slope of values against 0..n-1, in closed form (0.0 below two points)"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    x = np.arange(n, dtype=np.float64) - (n - 1) / 2
+    # sum((x - mean(x))**2) over 0..n-1 is (n**3 - n) / 12
+    return float(x @ (values - values.mean()) / ((n ** 3 - n) / 12.0))
+
+
+def _pearson(x: pd.Series, y: pd.Series) -> float:
+    """Pearson correlation over rows where both are present, as Series.corr; NaN below two rows"""
+    x = x.to_numpy(dtype=np.float64, na_value=np.nan)
+    y = y.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~(np.isnan(x) | np.isnan(y))
+    if present.sum() < 2:
+        return np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.corrcoef(x[present], y[present])[0, 1])
+
 
 class InsightsGenerator:
     def __init__(self, historical_df: pd.DataFrame, forecast_data: List[Dict],
                  metrics: ForecastMetrics, target_column: str = 'revenue',
                  feature_importance: Optional[List[FeatureImportance]] = None):
-        self.historical_df = historical_df.copy()
+        # Only ever read, so a shallow copy is enough
+        self.historical_df = historical_df.copy(deep=False)
         self.forecast_data = forecast_data
         self.metrics = metrics
         self.target_column = target_column
         self.feature_importance = feature_importance or []
     
+    # Each generate_* section reads the same aggregates; they are computed once per instance
+    @cached_property
+    def _forecast_values(self) -> np.ndarray:
+        return np.fromiter(
+            (f['predicted'] for f in self.forecast_data if 'predicted' in f), dtype=np.float64
+        )
+    
+    @cached_property
+    def _historical_total(self) -> float:
+        return self.historical_df[self.target_column].sum()
+    
+    @cached_property
+    def _historical_avg(self) -> float:
+        return self.historical_df[self.target_column].mean()
+    
+    @cached_property
+    def _monthly_avg(self) -> Optional[pd.Series]:
+        """Mean target per month, in month order (ties in idxmax/nlargest resolve by it)"""
+        if 'month' not in self.historical_df.columns:
+            return None
+        return self.historical_df.groupby('month')[self.target_column].mean()
+    
     def generate_title(self) -> str:
         accuracy = 100 - self.metrics.mape
         if accuracy >= 90:
@@ -35,12 +91,12 @@ class InsightsGenerator:
         return f"{quality} Sales Forecast Analysis"
     
     def generate_summary(self) -> str:
-        total_historical = self.historical_df[self.target_column].sum()
-        avg_historical = self.historical_df[self.target_column].mean()
+        total_historical = self._historical_total
+        avg_historical = self._historical_avg
         
-        forecast_values = [f['predicted'] for f in self.forecast_data if 'predicted' in f]
-        total_forecast = sum(forecast_values) if forecast_values else 0
-        avg_forecast = np.mean(forecast_values) if forecast_values else 0
+        forecast_values = self._forecast_values
+        total_forecast = forecast_values.sum() if forecast_values.size else 0
+        avg_forecast = forecast_values.mean() if forecast_values.size else 0
         
         growth = calculate_change_percentage(avg_forecast, avg_historical)
         
@@ -59,14 +115,17 @@ class InsightsGenerator:
     def generate_kpis(self) -> List[KPISnapshot]:
         kpis = []
         
-        current_year = self.historical_df['date'].dt.year.max()
+        years = self.historical_df['date'].dt.year
+        current_year = years.max()
         prev_year = current_year - 1
         
-        current_year_data = self.historical_df[self.historical_df['date'].dt.year == current_year]
-        prev_year_data = self.historical_df[self.historical_df['date'].dt.year == prev_year]
+        # Masked sums over the raw arrays; no filtered copies of the frame
+        year_values = years.to_numpy()
+        target = self.historical_df[self.target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        prev_mask = year_values == prev_year
         
-        current_total = current_year_data[self.target_column].sum()
-        prev_total = prev_year_data[self.target_column].sum() if len(prev_year_data) > 0 else 0
+        current_total = np.nansum(target[year_values == current_year])
+        prev_total = np.nansum(target[prev_mask]) if prev_mask.any() else 0
         
         if prev_total > 0:
             yoy_growth = calculate_change_percentage(current_total, prev_total)
@@ -76,11 +135,11 @@ class InsightsGenerator:
                 trend="up" if yoy_growth > 0 else "down" if yoy_growth < 0 else "neutral"
             ))
         
-        forecast_values = [f['predicted'] for f in self.forecast_data]
-        if forecast_values:
+        forecast_values = self._forecast_values
+        if forecast_values.size:
             forecast_growth = calculate_change_percentage(
-                np.mean(forecast_values),
-                self.historical_df[self.target_column].mean()
+                forecast_values.mean(),
+                self._historical_avg
             )
             kpis.append(KPISnapshot(
                 name="Forecast vs Historical",
@@ -100,8 +159,8 @@ class InsightsGenerator:
             trend="neutral"
         ))
         
-        if 'month' in self.historical_df.columns:
-            monthly_avg = self.historical_df.groupby('month')[self.target_column].mean()
+        monthly_avg = self._monthly_avg
+        if monthly_avg is not None:
             peak_month = monthly_avg.idxmax()
             seasonality_strength = (monthly_avg.max() - monthly_avg.min()) / monthly_avg.mean() * 100
             
@@ -117,8 +176,8 @@ class InsightsGenerator:
     def generate_bullets(self) -> List[InsightBullet]:
         bullets = []
         
-        total = self.historical_df[self.target_column].sum()
-        avg = self.historical_df[self.target_column].mean()
+        total = self._historical_total
+        avg = self._historical_avg
         
         bullets.append(InsightBullet(
             icon="chart-line",
@@ -126,16 +185,13 @@ class InsightsGenerator:
             severity="info"
         ))
         
-        if 'month' in self.historical_df.columns:
-            monthly_data = self.historical_df.groupby('month')[self.target_column].mean()
+        monthly_data = self._monthly_avg
+        if monthly_data is not None:
             peak_month = monthly_data.idxmax()
             low_month = monthly_data.idxmin()
             
-            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            
-            peak_name = month_names[peak_month - 1] if 1 <= peak_month <= 12 else str(peak_month)
-            low_name = month_names[low_month - 1] if 1 <= low_month <= 12 else str(low_month)
+            peak_name = MONTH_ABBREVIATIONS[peak_month - 1] if 1 <= peak_month <= 12 else str(peak_month)
+            low_name = MONTH_ABBREVIATIONS[low_month - 1] if 1 <= low_month <= 12 else str(low_month)
             
             variance = (monthly_data.max() - monthly_data.min()) / monthly_data.mean() * 100
             
@@ -152,9 +208,9 @@ class InsightsGenerator:
                     severity="info"
                 ))
         
-        forecast_values = [f['predicted'] for f in self.forecast_data]
-        if forecast_values:
-            forecast_trend = np.polyfit(range(len(forecast_values)), forecast_values, 1)[0]
+        forecast_values = self._forecast_values
+        if forecast_values.size:
+            forecast_trend = _trend_slope(forecast_values)
             
             if forecast_trend > 0:
                 bullets.append(InsightBullet(
@@ -209,16 +265,13 @@ class InsightsGenerator:
     def generate_recommendations(self) -> List[Recommendation]:
         recommendations = []
         
-        if 'month' in self.historical_df.columns:
-            monthly_data = self.historical_df.groupby('month')[self.target_column].mean()
+        monthly_data = self._monthly_avg
+        if monthly_data is not None:
             peak_months = monthly_data.nlargest(3).index.tolist()
             low_months = monthly_data.nsmallest(3).index.tolist()
             
-            month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                          'July', 'August', 'September', 'October', 'November', 'December']
-            
-            peak_names = [month_names[m-1] for m in peak_months if 1 <= m <= 12]
-            low_names = [month_names[m-1] for m in low_months if 1 <= m <= 12]
+            peak_names = [MONTH_NAMES[m-1] for m in peak_months if 1 <= m <= 12]
+            low_names = [MONTH_NAMES[m-1] for m in low_months if 1 <= m <= 12]
             
             recommendations.append(Recommendation(
                 category="Inventory",
@@ -259,7 +312,7 @@ class InsightsGenerator:
             ))
         
         if 'price' in self.historical_df.columns:
-            price_revenue_corr = self.historical_df['price'].corr(self.historical_df[self.target_column])
+            price_revenue_corr = _pearson(self.historical_df['price'], self.historical_df[self.target_column])
             
             if price_revenue_corr > 0.3:
                 recommendations.append(Recommendation(
@@ -301,8 +354,8 @@ class InsightsGenerator:
         return {
             'title': self.generate_title(),
             'summary': self.generate_summary(),
-            'kpis': [kpi.model_dump() for kpi in self.generate_kpis()],
-            'bullets': [bullet.model_dump() for bullet in self.generate_bullets()],
-            'recommendations': [rec.model_dump() for rec in self.generate_recommendations()],
-            'generated_at': datetime.utcnow().isoformat()
+            'kpis': _KPI_LIST.dump_python(self.generate_kpis()),
+            'bullets': _BULLET_LIST.dump_python(self.generate_bullets()),
+            'recommendations': _RECOMMENDATION_LIST.dump_python(self.generate_recommendations()),
+            'generated_at': datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
         }
@@ -0,0 +1,306 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+
+# PDF charts are independent and CPU-bound, so they render in a small process
+# pool; every chart function is top-level (picklable) and returns a raw RGB
+# raster as (width, height, bytes)
+CHART_WORKERS = min(4, os.cpu_count() or 1)
+
+# Figures are sized in inches to match where the PDF places them, so at this
+# DPI the raster is embedded 1:1 rather than downsampled by the viewer
+CHART_DPI = 96
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Bar colour ramps for up to 10 bars, sampled once instead of per chart
+_BLUES_LUT = {n: plt.cm.Blues(np.linspace(0.4, 0.9, n)) for n in range(1, 11)}
+_GREENS_LUT = {n: plt.cm.Greens(np.linspace(0.4, 0.9, n)) for n in range(1, 11)}
+
+# Figures are reused per process, keyed by figsize, and cleared before each chart
+_FIGURE_POOL: Dict[Tuple[float, float], Figure] = {}
+
+
+def _init_worker() -> None:
+    # Unpickling this initializer already imported pyplot in the worker
+    matplotlib.use('Agg')
+    # Warm the font lookup cache so the first chart doesn't pay for it
+    font_manager.findfont(font_manager.FontProperties(family=matplotlib.rcParams['font.family']))
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=CHART_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+    return _executor
+
+
+def shutdown_chart_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def render_charts(jobs: Dict[str, Tuple[Callable, tuple]]) -> Dict[str, Any]:
+    """Render charts in parallel; each result is the chart's return value or the exception it raised"""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    names = list(jobs)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, fn, *args) for fn, args in jobs.values()),
+        return_exceptions=True
+    )
+    if any(isinstance(r, BrokenProcessPool) for r in results):
+        # A crashed worker breaks the whole pool; start a fresh one next time
+        shutdown_chart_pool()
+    return dict(zip(names, results))
+
+
+def _frame(records, columns) -> pd.DataFrame:
+    # One columnar pass over the list of dicts; missing keys become NaN
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def _values(df: pd.DataFrame, column: str, fill: Optional[float] = None) -> np.ndarray:
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    if fill is not None:
+        values = np.nan_to_num(values, nan=fill)
+    return values
+
+
+def _dates(df: pd.DataFrame) -> np.ndarray:
+    return df['date'].fillna('').astype(str).str[:10].to_numpy()
+
+
+def _get_fig(figsize: Tuple[float, float]):
+    fig = _FIGURE_POOL.get(figsize)
+    if fig is None:
+        # Outside pyplot's figure manager, so pooled figures are never "current"
+        fig = Figure(figsize=figsize, dpi=CHART_DPI)
+        FigureCanvasAgg(fig)
+        _FIGURE_POOL[figsize] = fig
+    fig.clf()
+    return fig, fig.add_subplot(111)
+
+
+def _residuals(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Deviation of each value from the mean, and which deviations are non-negative"""
+    if not len(values):
+        return values, np.zeros(0, dtype=bool)
+    residuals = values - values.mean()
+    return residuals, residuals >= 0
+
+
+def _to_rgb(fig) -> Tuple[int, int, bytes]:
+    # Hand back the Agg raster as-is: no PNG deflate here and no PNG decode in
+    # ReportLab. The figures are laid out with tight_layout, so one draw suffices.
+    # The figure stays in the pool; the next chart of this size clears it.
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height()
+    rgb = np.asarray(fig.canvas.buffer_rgba())[:, :, :3].tobytes()
+    return width, height, rgb
+
+
+def create_forecast_chart(historical, forecast_data):
+    fig, ax = _get_fig((6.5, 3.25))
+    
+    hist = _frame(historical, ['date', 'actual'])
+    fore = _frame(forecast_data, ['date', 'predicted', 'lower_bound', 'upper_bound'])
+    
+    hist_values = _values(hist, 'actual', fill=0.0)
+    fore_values = _values(fore, 'predicted', fill=0.0)
+    lower_bounds = _values(fore, 'lower_bound')
+    upper_bounds = _values(fore, 'upper_bound')
+    
+    ax.plot(np.arange(len(hist)), hist_values, 'b-', linewidth=2, label='Historical')
+    
+    fore_range = np.arange(len(hist), len(hist) + len(fore))
+    ax.plot(fore_range, fore_values, 'purple', linestyle='--', linewidth=2, label='Forecast')
+    ax.fill_between(fore_range, lower_bounds, upper_bounds, color='purple', alpha=0.2, label='Confidence Interval')
+    
+    all_dates = np.concatenate([_dates(hist), _dates(fore)])
+    step = max(1, len(all_dates) // 8)
+    ticks = np.arange(0, len(all_dates), step)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(all_dates[ticks], rotation=45, ha='right')
+    
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Value')
+    ax.set_title('Forecast Trend - Historical vs Predictions', fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
+
+
+def create_residuals_chart(historical):
+    fig, ax = _get_fig((6.5, 2.5))
+    
+    values = _values(_frame(historical[-20:], ['actual']), 'actual', fill=0.0)
+    
+    residuals, positive = _residuals(values)
+    
+    colors_list = np.where(positive, '#06b6d4', '#f43f5e')
+    ax.bar(np.arange(len(residuals)), residuals, color=colors_list, alpha=0.8)
+    
+    ax.axhline(y=0, color='gray', linestyle='-', linewidth=1)
+    ax.set_xlabel('Period')
+    ax.set_ylabel('Residual Value')
+    ax.set_title('Forecast Residuals (Deviation from Mean)', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
+
+
+def create_comparison_chart(historical, forecast_data):
+    fig, ax = _get_fig((5, 2.5))
+    
+    hist_total = _values(_frame(historical, ['actual']), 'actual', fill=0.0).sum()
+    fore_total = _values(_frame(forecast_data, ['predicted']), 'predicted', fill=0.0).sum()
+    
+    categories = ['Historical Total', 'Forecast Total']
+    values = [hist_total, fore_total]
+    colors_list = ['#3b82f6', '#8b5cf6']
+    
+    bars = ax.bar(categories, values, color=colors_list, width=0.6)
+    
+    for bar, val in zip(bars, values):
+        height = bar.get_height()
+        ax.annotate(f'{val:,.0f}',
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+    
+    # Headroom so the value labels clear the title at the smaller figure size
+    ax.margins(y=0.15)
+    ax.set_ylabel('Total Value')
+    ax.set_title('Historical vs Forecast Comparison', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
+
+
+def create_feature_importance_chart(feature_importance):
+    if not feature_importance:
+        return None
+    
+    fig, ax = _get_fig((5, 3))
+    
+    top = _frame(feature_importance[:10], ['feature', 'importance']).iloc[::-1]
+    features = top['feature'].fillna('').astype(str).to_numpy()
+    importance = _values(top, 'importance', fill=0.0)
+    
+    colors_list = _BLUES_LUT[len(features)]
+    
+    ax.barh(features, importance, color=colors_list)
+    ax.set_xlabel('Importance (%)')
+    ax.set_title('Feature Importance Rankings', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
+
+
+def create_decomposition_charts(decomposition):
+    if not decomposition:
+        return None, None
+    
+    trend_chart = None
+    seasonal_chart = None
+    
+    trend_data = decomposition.get('trend', [])
+    if trend_data:
+        fig, ax = _get_fig((6.5, 2))
+        dates = np.arange(len(trend_data))
+        values = _values(_frame(trend_data, ['value']), 'value', fill=0.0)
+        ax.plot(dates, values, 'b-', linewidth=2)
+        ax.set_title('Trend Component', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Period')
+        ax.set_ylabel('Value')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        trend_chart = _to_rgb(fig)
+    
+    seasonal_data = decomposition.get('seasonal', [])
+    if seasonal_data:
+        fig, ax = _get_fig((6.5, 2))
+        dates = np.arange(len(seasonal_data))
+        values = _values(_frame(seasonal_data, ['value']), 'value', fill=0.0)
+        ax.fill_between(dates, values, alpha=0.5, color='purple')
+        ax.plot(dates, values, 'purple', linewidth=2)
+        ax.set_title('Seasonal Component', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Period')
+        ax.set_ylabel('Value')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        seasonal_chart = _to_rgb(fig)
+    
+    return trend_chart, seasonal_chart
+
+
+def create_top_products_chart(top_products):
+    if not top_products:
+        return None
+    
+    fig, ax = _get_fig((5, 2.5))
+    
+    products = [p.get('name', '')[:15] for p in top_products[:5]]
+    values = [p.get('value', 0) for p in top_products[:5]]
+    
+    products = products[::-1]
+    values = values[::-1]
+    
+    colors_list = _GREENS_LUT[len(products)]
+    
+    ax.barh(products, values, color=colors_list)
+    ax.set_xlabel('Value')
+    ax.set_title('Top Products by Revenue', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
+
+
+def create_top_regions_chart(top_regions):
+    if not top_regions:
+        return None
+    
+    fig, ax = _get_fig((4, 4))
+    
+    regions = [r.get('name', '') for r in top_regions[:5]]
+    values = [r.get('value', 0) for r in top_regions[:5]]
+    
+    colors_list = ['#3b82f6', '#8b5cf6', '#ec4899', '#f59e0b', '#10b981']
+    
+    ax.pie(values, labels=regions, autopct='%1.1f%%', colors=colors_list[:len(regions)], startangle=90)
+    ax.set_title('Top Regions Distribution', fontsize=14, fontweight='bold')
+    
+    fig.tight_layout()
+    
+    return _to_rgb(fig)
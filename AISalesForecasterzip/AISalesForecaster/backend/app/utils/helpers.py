@@ -1,13 +1,48 @@
-import uuid
+import time
+import secrets
 import hashlib
-from datetime import datetime
-from typing import List, Any
+from typing import Iterator, List, Any, Optional, Sequence
+
+from fastapi import Request, Response
+from pydantic import BaseModel
 
 
 def generate_job_id() -> str:
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    unique_part = uuid.uuid4().hex[:8]
-    return f"job_{timestamp}_{unique_part}"
+    # Same job_<UTC yyyymmddHHMMSS>_<8 hex> shape as before, from 4 random bytes
+    # rather than a whole UUID
+    timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+    return f"job_{timestamp}_{secrets.token_hex(4)}"
+
+
+def model_json_response(model: BaseModel, headers: Optional[dict] = None) -> Response:
+    # pydantic-core writes the JSON bytes in one pass; returning a Response skips
+    # FastAPI re-validating the model against response_model and encoding it again
+    return Response(content=model.model_dump_json(), media_type="application/json", headers=headers)
+
+
+# Clients may keep a copy but must revalidate it: a new forecast or insights row
+# for the job changes the ETag, and that has to show up on the next request
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag for a response that is fully determined by `parts`, e.g. a row's id and created_at"""
+    return '"' + hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest() + '"'
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the client's If-None-Match already names `etag`, else None"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
 
 
 def calculate_change_percentage(current: float, previous: float) -> float:
@@ -17,11 +52,12 @@ def calculate_change_percentage(current: float, previous: float) -> float:
 
 
 def format_number(value: float, decimals: int = 2) -> str:
-    if abs(value) >= 1_000_000_000:
+    magnitude = abs(value)
+    if magnitude >= 1_000_000_000:
         return f"{value / 1_000_000_000:.{decimals}f}B"
-    elif abs(value) >= 1_000_000:
+    elif magnitude >= 1_000_000:
         return f"{value / 1_000_000:.{decimals}f}M"
-    elif abs(value) >= 1_000:
+    elif magnitude >= 1_000:
         return f"{value / 1_000:.{decimals}f}K"
     else:
         return f"{value:.{decimals}f}"
@@ -37,20 +73,28 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     return numerator / denominator
 
 
+# Season of months 1-12, keyed by month
+_SEASONS = {
+    12: "Winter", 1: "Winter", 2: "Winter",
+    3: "Spring", 4: "Spring", 5: "Spring",
+    6: "Summer", 7: "Summer", 8: "Summer",
+    9: "Fall", 10: "Fall", 11: "Fall"
+}
+
+
 def get_season(month: int) -> str:
-    if month in [12, 1, 2]:
-        return "Winter"
-    elif month in [3, 4, 5]:
-        return "Spring"
-    elif month in [6, 7, 8]:
-        return "Summer"
-    else:
-        return "Fall"
+    return _SEASONS.get(month, "Fall")
 
 
 def get_quarter(month: int) -> int:
     return (month - 1) // 3 + 1
 
 
+def ichunks(seq: Sequence[Any], chunk_size: int) -> Iterator[Sequence[Any]]:
+    """Consecutive chunk_size slices of seq, yielded lazily; ndarray slices are views"""
+    for i in range(0, len(seq), chunk_size):
+        yield seq[i:i + chunk_size]
+
+
 def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+    return list(ichunks(lst, chunk_size))
@@ -1,6 +1,11 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
-from typing import List, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+EPOCH = date(1970, 1, 1)
 
 US_HOLIDAYS = {
     (1, 1): "New Year's Day",
@@ -21,25 +26,28 @@ FLOATING_HOLIDAYS = [
 
 
 def get_nth_weekday_of_month(year: int, month: int, weekday: int, n: int) -> date:
+    """
+    The n-th given weekday (Monday = 0) of the month, or the last one for n <= 0;
+    ValueError if the month has no n-th occurrence
+    """
+    # Proleptic ordinals: day 1 (0001-01-01) was a Monday, so weekday = (ordinal + 6) % 7
     if n > 0:
-        first_day = date(year, month, 1)
-        first_weekday = first_day.weekday()
-        days_until = (weekday - first_weekday) % 7
-        first_occurrence = first_day.replace(day=1 + days_until)
-        return first_occurrence.replace(day=first_occurrence.day + (n - 1) * 7)
+        first = date(year, month, 1).toordinal()
+        day = first + (weekday - (first + 6) % 7) % 7 + (n - 1) * 7
     else:
-        if month == 12:
-            next_month = date(year + 1, 1, 1)
-        else:
-            next_month = date(year, month + 1, 1)
-        last_day = (next_month - pd.Timedelta(days=1)).day
-        last_date = date(year, month, last_day)
-        last_weekday = last_date.weekday()
-        days_back = (last_weekday - weekday) % 7
-        return last_date.replace(day=last_date.day - days_back)
+        next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        last = next_month.toordinal() - 1
+        day = last - ((last + 6) % 7 - weekday) % 7
+    
+    result = date.fromordinal(day)
+    if result.month != month:
+        raise ValueError(f"Month {year}-{month:02d} has no occurrence {n} of weekday {weekday}")
+    return result
 
 
-def get_holidays_for_year(year: int) -> Dict[date, str]:
+@lru_cache(maxsize=None)
+def get_holidays_for_year(year: int) -> Mapping[date, str]:
+    """Holiday dates and names for one year, computed once per year and returned read-only"""
     holidays = {}
     
     for (month, day), name in US_HOLIDAYS.items():
@@ -57,37 +65,53 @@ def get_holidays_for_year(year: int) -> Dict[date, str]:
         except (ValueError, AttributeError):
             pass
     
-    return holidays
+    return MappingProxyType(holidays)
 
 
-def get_holiday_flags(dates: pd.Series) -> pd.DataFrame:
-    dates = pd.to_datetime(dates)
-    years = dates.dt.year.unique()
-    
+@lru_cache(maxsize=256)
+def _holiday_table(years: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted holiday day numbers (days since 1970-01-01) and their names for the given years"""
     all_holidays = {}
     for year in years:
         all_holidays.update(get_holidays_for_year(year))
     
-    result = pd.DataFrame({
-        'date': dates,
-        'is_holiday': dates.dt.date.isin(all_holidays.keys()).astype(int),
-        'holiday_name': dates.dt.date.map(lambda x: all_holidays.get(x, ''))
-    })
+    holiday_dates = sorted(all_holidays)
+    days = np.array([(h - EPOCH).days for h in holiday_dates], dtype=np.int64)
+    names = np.array([all_holidays[h] for h in holiday_dates] + [''], dtype=object)
+    return days, names
+
+
+def get_holiday_flags(dates: pd.Series) -> pd.DataFrame:
+    dates = pd.to_datetime(dates)
+    if dates.isna().any():
+        raise ValueError("Cannot compute holiday flags for missing dates")
     
-    result['days_to_holiday'] = 0
-    result['days_from_holiday'] = 0
+    # Local calendar day of each row as an integer, then binary searches into the
+    # sorted holiday days instead of scanning the holiday list per row
+    local = dates.dt.tz_localize(None) if dates.dt.tz is not None else dates
+    days = local.to_numpy().astype('datetime64[D]').view(np.int64)
+    holiday_days, names = _holiday_table(tuple(sorted(int(y) for y in dates.dt.year.unique())))
     
-    holiday_dates = sorted(all_holidays.keys())
+    n_holidays = len(holiday_days)
+    first_at_or_after = np.searchsorted(holiday_days, days, side='left')
+    first_after = np.searchsorted(holiday_days, days, side='right')
+    is_holiday = first_after > first_at_or_after
     
-    for idx, row in result.iterrows():
-        current_date = row['date'].date()
-        
-        future_holidays = [h for h in holiday_dates if h > current_date]
-        if future_holidays:
-            result.at[idx, 'days_to_holiday'] = (future_holidays[0] - current_date).days
-        
-        past_holidays = [h for h in holiday_dates if h < current_date]
-        if past_holidays:
-            result.at[idx, 'days_from_holiday'] = (current_date - past_holidays[-1]).days
+    # names[-1] is '' so non-holidays index past the end of the real names
+    name_idx = np.where(is_holiday, first_at_or_after, n_holidays)
+    next_idx = np.minimum(first_after, n_holidays - 1)
+    prev_idx = np.maximum(first_at_or_after - 1, 0)
+    
+    if n_holidays:
+        days_to = np.where(first_after < n_holidays, holiday_days[next_idx] - days, 0)
+        days_from = np.where(first_at_or_after > 0, days - holiday_days[prev_idx], 0)
+    else:
+        days_to = days_from = np.zeros(len(days), dtype=np.int64)
     
-    return result[['is_holiday', 'holiday_name', 'days_to_holiday', 'days_from_holiday']]
+    # Flags and day gaps are small integers; narrow dtypes keep the feature frame compact
+    return pd.DataFrame({
+        'is_holiday': is_holiday.astype(np.int8),
+        'holiday_name': names[name_idx],
+        'days_to_holiday': days_to.astype(np.int16),
+        'days_from_holiday': days_from.astype(np.int16)
+    }, index=dates.index)
@@ -0,0 +1,91 @@
+import os
+import glob
+import uuid
+import hashlib
+import tempfile
+import logging
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Finished reports are kept on disk so repeat downloads skip chart rendering
+# and PDF layout entirely. Each job keeps only its latest version per format.
+REPORT_CACHE_DIR = os.environ.get(
+    "REPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "forecast_reports")
+)
+os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+
+
+def report_cache_path(job_id: str, forecast: dict, insights: Optional[dict], ext: str) -> str:
+    """Path of the cached report for this exact forecast and insights version"""
+    version = (
+        f"{forecast.get('id')}:{forecast.get('created_at')}:"
+        f"{insights.get('id') if insights else ''}:{insights.get('created_at') if insights else ''}"
+    )
+    digest = hashlib.sha1(version.encode()).hexdigest()[:16]
+    return os.path.join(REPORT_CACHE_DIR, f"{job_id}_{digest}.{ext}")
+
+
+def _job_id_from_path(path: str) -> str:
+    return os.path.basename(path).rsplit('_', 1)[0]
+
+
+def _job_cache_files(job_id: str, suffix: str = '') -> Iterator[str]:
+    """Cache files of exactly this job; the id is escaped so glob characters in it match literally"""
+    pattern = os.path.join(REPORT_CACHE_DIR, f"{glob.escape(job_id)}_*{glob.escape(suffix)}")
+    # '_*' alone would also match jobs whose id extends this one past an underscore
+    return (path for path in glob.iglob(pattern) if _job_id_from_path(path) == job_id)
+
+
+def _evict_stale(path: str) -> None:
+    ext = os.path.splitext(path)[1]
+    for stale in _job_cache_files(_job_id_from_path(path), ext):
+        if stale != path:
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
+
+
+def temp_report_path(path: str) -> str:
+    """Unique scratch file next to the cache entry, so publishing is a same-filesystem rename"""
+    return f"{path}.{uuid.uuid4().hex}.tmp"
+
+
+def publish_report_cache(tmp_path: str, path: str) -> bool:
+    """Move a finished report into the cache; False if it has to be served from tmp_path"""
+    try:
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache report %s: %s", path, e)
+        return False
+    _evict_stale(path)
+    return True
+
+
+def tee_report_cache(path: str, chunks: Iterator[str]) -> Iterator[str]:
+    """Pass text chunks through while saving them; the file is only kept if the stream completes"""
+    tmp_path = temp_report_path(path)
+    completed = False
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp_path, path)
+        completed = True
+    finally:
+        if not completed:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    _evict_stale(path)
+
+
+def evict_report_cache(job_id: str) -> None:
+    for path in list(_job_cache_files(job_id)):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
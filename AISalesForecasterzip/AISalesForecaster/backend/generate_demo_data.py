@@ -1,19 +1,28 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime, timedelta
 import random
 import os
 
-np.random.seed(42)
-random.seed(42)
+N_PRODUCTS = 50
+CATEGORIES = ["Electronics", "Clothing", "Home", "Sports", "Food"]
 
-PRODUCTS = [
-    {"id": f"SKU{str(i).zfill(3)}", "name": f"Product {chr(65 + i // 10)}{i % 10}", 
-     "base_price": round(random.uniform(10, 500), 2),
-     "category": random.choice(["Electronics", "Clothing", "Home", "Sports", "Food"])}
-    for i in range(50)
+# Product table as parallel arrays indexed by product number. Prices and categories
+# come from a private Random(42) drawn in the original per-product order, so the
+# catalogue is unchanged without seeding the global random module at import.
+_product_rng = random.Random(42)
+_product_draws = [
+    (round(_product_rng.uniform(10, 500), 2), _product_rng.choice(CATEGORIES))
+    for _ in range(N_PRODUCTS)
 ]
 
+PRODUCT_IDS = np.array([f"SKU{str(i).zfill(3)}" for i in range(N_PRODUCTS)])
+PRODUCT_NAMES = np.array([f"Product {chr(65 + i // 10)}{i % 10}" for i in range(N_PRODUCTS)])
+PRODUCT_BASE_PRICES = np.array([price for price, _ in _product_draws], dtype=np.float64)
+PRODUCT_CATEGORIES = np.array([category for _, category in _product_draws])
+
 REGIONS = ["North", "South", "East", "West"]
 
 SEASONALITY = {
@@ -31,6 +40,9 @@ SEASONALITY = {
     12: 1.40,
 }
 
+# SEASONALITY indexed directly by month number; slot 0 is padding so month arrays index as-is
+SEASONALITY_BY_MONTH = np.array([1.0] + [SEASONALITY[month] for month in range(1, 13)])
+
 HOLIDAYS = [
     (1, 1),
     (2, 14),
@@ -45,6 +57,22 @@ HOLIDAYS = [
 ]
 
 
+def _iso_days(date_range: pd.DatetimeIndex) -> np.ndarray:
+    """YYYY-MM-DD text for each day, formatted by NumPy in one C pass"""
+    return np.datetime_as_string(date_range.values.astype("datetime64[D]"))
+
+
+def _write_csv(df: pd.DataFrame, output_path: str) -> None:
+    """Write df through Arrow's C++ CSV writer, keeping pandas' bare header line"""
+    with open(output_path, "wb") as f:
+        f.write((",".join(df.columns) + "\n").encode())
+        pacsv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False),
+            f,
+            write_options=pacsv.WriteOptions(include_header=False, quoting_style="none"),
+        )
+
+
 def generate_demo_data(
     start_date: str = "2022-01-01",
     end_date: str = "2023-12-31",
@@ -55,69 +83,58 @@ def generate_demo_data(
     
     date_range = pd.date_range(start=start, end=end, freq='D')
     
-    records = []
+    # One row per (date, product, region), date-major as the per-row loop emitted
+    # them; every random draw is a single array call over the whole grid
+    rng = np.random.default_rng(42)
+    n_days, n_products, n_regions = len(date_range), N_PRODUCTS, len(REGIONS)
+    day_idx = np.repeat(np.arange(n_days), n_products * n_regions)
+    product_idx = np.tile(np.repeat(np.arange(n_products), n_regions), n_days)
+    region_idx = np.tile(np.arange(n_regions), n_days * n_products)
+    
+    keep = rng.random(len(day_idx)) <= 0.7
+    day_idx, product_idx, region_idx = day_idx[keep], product_idx[keep], region_idx[keep]
+    n_rows = len(day_idx)
     
-    base_trend = 0
     trend_growth = 0.0005
+    base_trend = trend_growth * np.arange(1, n_days + 1)
+    seasonal_factor = SEASONALITY_BY_MONTH[date_range.month]
+    # (month, day) pairs compared as month * 100 + day codes, one isin over all days
+    holiday_codes = [month * 100 + day for month, day in HOLIDAYS]
+    is_holiday = np.isin(date_range.month * 100 + date_range.day, holiday_codes)
+    holiday_boost = np.where(is_holiday, 1.3, 1.0)
+    weekend_factor = np.where(date_range.weekday >= 5, 1.15, 1.0)
+    day_factor = seasonal_factor * holiday_boost * weekend_factor * (1 + base_trend)
     
-    for current_date in date_range:
-        base_trend += trend_growth
-        
-        seasonal_factor = SEASONALITY.get(current_date.month, 1.0)
-        
-        is_holiday = (current_date.month, current_date.day) in HOLIDAYS
-        holiday_boost = 1.3 if is_holiday else 1.0
-        
-        is_weekend = current_date.weekday() >= 5
-        weekend_factor = 1.15 if is_weekend else 1.0
-        
-        for product in PRODUCTS:
-            for region in REGIONS:
-                if random.random() > 0.7:
-                    continue
-                
-                base_units = random.randint(5, 50)
-                
-                units_sold = int(
-                    base_units 
-                    * seasonal_factor 
-                    * holiday_boost 
-                    * weekend_factor 
-                    * (1 + base_trend)
-                    * random.uniform(0.7, 1.3)
-                )
-                
-                promotion_flag = 0
-                price_discount = 1.0
-                
-                if random.random() < 0.15:
-                    promotion_flag = 1
-                    price_discount = random.uniform(0.8, 0.95)
-                    units_sold = int(units_sold * random.uniform(1.2, 1.5))
-                
-                if is_holiday and random.random() < 0.3:
-                    promotion_flag = 1
-                    price_discount = random.uniform(0.75, 0.9)
-                
-                price = round(product["base_price"] * price_discount, 2)
-                
-                revenue = round(units_sold * price, 2)
-                
-                records.append({
-                    "date": current_date.strftime("%Y-%m-%d"),
-                    "product_id": product["id"],
-                    "product_name": product["name"],
-                    "region": region,
-                    "units_sold": max(1, units_sold),
-                    "revenue": max(price, revenue),
-                    "price": price,
-                    "promotion_flag": promotion_flag,
-                })
-    
-    df = pd.DataFrame(records)
+    base_units = rng.integers(5, 51, n_rows)
+    units_sold = (base_units * day_factor[day_idx] * rng.uniform(0.7, 1.3, n_rows)).astype(np.int64)
+    
+    promoted = rng.random(n_rows) < 0.15
+    price_discount = np.where(promoted, rng.uniform(0.8, 0.95, n_rows), 1.0)
+    units_sold = np.where(promoted, (units_sold * rng.uniform(1.2, 1.5, n_rows)).astype(np.int64), units_sold)
+    
+    # Holiday promotions set the discount but do not boost units
+    holiday_promo = is_holiday[day_idx] & (rng.random(n_rows) < 0.3)
+    price_discount = np.where(holiday_promo, rng.uniform(0.75, 0.9, n_rows), price_discount)
+    promotion_flag = (promoted | holiday_promo).astype(np.int8)
+    
+    price = np.round(PRODUCT_BASE_PRICES[product_idx] * price_discount, 2)
+    revenue = np.round(units_sold * price, 2)
+    
+    df = pd.DataFrame({
+        "date": _iso_days(date_range)[day_idx],
+        # Categoricals over the fixed vocabularies: small integer codes per row, same CSV text
+        "product_id": pd.Categorical.from_codes(product_idx, categories=PRODUCT_IDS),
+        "product_name": pd.Categorical.from_codes(product_idx, categories=PRODUCT_NAMES),
+        "region": pd.Categorical.from_codes(region_idx, categories=REGIONS),
+        # Counts fit int32 and flags int8; revenue and price stay float64 so cents are exact
+        "units_sold": np.maximum(1, units_sold).astype(np.int32),
+        "revenue": np.maximum(price, revenue),
+        "price": price,
+        "promotion_flag": promotion_flag,
+    })
     
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False)
+    _write_csv(df, output_path)
     
     print(f"Generated {len(df):,} records")
     print(f"Date range: {df['date'].min()} to {df['date'].max()}")
@@ -134,30 +151,27 @@ def generate_simple_demo(output_path: str = "backend/data/simple_demo.csv"):
     end = datetime.strptime("2023-12-31", "%Y-%m-%d")
     date_range = pd.date_range(start=start, end=end, freq='D')
     
-    records = []
+    rng = np.random.default_rng(42)
+    n_days = len(date_range)
     base_revenue = 10000
     
-    for current_date in date_range:
-        seasonal = SEASONALITY.get(current_date.month, 1.0)
-        trend = 1 + (current_date - start).days * 0.0003
-        noise = random.uniform(0.85, 1.15)
-        
-        revenue = base_revenue * seasonal * trend * noise
-        units = int(revenue / 25)
-        
-        records.append({
-            "date": current_date.strftime("%Y-%m-%d"),
-            "product_id": "ALL",
-            "product_name": "All Products",
-            "region": "All Regions",
-            "units_sold": units,
-            "revenue": round(revenue, 2),
-            "price": 25.00,
-            "promotion_flag": 1 if random.random() < 0.1 else 0,
-        })
-    
-    df = pd.DataFrame(records)
-    df.to_csv(output_path, index=False)
+    seasonal = SEASONALITY_BY_MONTH[date_range.month]
+    trend = 1 + (date_range - start).days.to_numpy() * 0.0003
+    noise = rng.uniform(0.85, 1.15, n_days)
+    
+    revenue = base_revenue * seasonal * trend * noise
+    
+    df = pd.DataFrame({
+        "date": _iso_days(date_range),
+        "product_id": "ALL",
+        "product_name": "All Products",
+        "region": "All Regions",
+        "units_sold": (revenue / 25).astype(np.int32),
+        "revenue": np.round(revenue, 2),
+        "price": 25.00,
+        "promotion_flag": (rng.random(n_days) < 0.1).astype(np.int8),
+    })
+    _write_csv(df, output_path)
     
     print(f"Generated simple demo with {len(df)} daily records")
     print(f"Saved to: {output_path}")
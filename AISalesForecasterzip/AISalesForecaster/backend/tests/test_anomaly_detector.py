@@ -0,0 +1,97 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.anomaly_detector import AnomalyDetector, RecommendationEngine
+
+
+def create_series_with_outliers(n_rows=60):
+    dates = pd.date_range(start='2023-01-01', periods=n_rows, freq='D')
+    values = np.full(n_rows, 100.0)
+    values[10] = 400.0
+    values[40] = 5.0
+    
+    return pd.DataFrame({'date': dates, 'actual': values})
+
+
+class TestAnomalyDetector:
+    def test_iqr_flags_spike_and_dip(self):
+        anomalies = AnomalyDetector.detect_anomalies(create_series_with_outliers())
+        
+        assert [a['anomaly_type'] for a in anomalies] == ['spike', 'dip']
+        assert anomalies[0]['date'] == '2023-01-11'
+        assert anomalies[0]['value'] == 400.0
+        assert anomalies[0]['severity'] > anomalies[1]['severity']
+    
+    def test_zscore_includes_z_score(self):
+        anomalies = AnomalyDetector.detect_anomalies(
+            create_series_with_outliers(), method='zscore', threshold=3.0
+        )
+        
+        assert len(anomalies) >= 1
+        assert all('z_score' in a for a in anomalies)
+        assert anomalies[0]['anomaly_type'] == 'spike'
+    
+    def test_string_dates(self):
+        df = create_series_with_outliers()
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+        
+        anomalies = AnomalyDetector.detect_anomalies(df)
+        
+        assert anomalies[0]['date'] == '2023-01-11'
+        assert '2023-01-11' in anomalies[0]['description']
+    
+    def test_missing_values_skipped(self):
+        df = create_series_with_outliers()
+        df.loc[20:25, 'actual'] = np.nan
+        
+        anomalies = AnomalyDetector.detect_anomalies(df)
+        
+        assert all(not np.isnan(a['value']) for a in anomalies)
+        assert len(anomalies) == 2
+    
+    def test_at_most_ten(self):
+        dates = pd.date_range(start='2023-01-01', periods=100, freq='D')
+        values = np.full(100, 100.0)
+        values[::5] = 1000.0 + np.arange(20)
+        
+        anomalies = AnomalyDetector.detect_anomalies(
+            pd.DataFrame({'date': dates, 'actual': values}), method='zscore', threshold=1.0
+        )
+        
+        assert len(anomalies) == 10
+        severities = [a['severity'] for a in anomalies]
+        assert severities == sorted(severities, reverse=True)
+    
+    def test_short_series_returns_empty(self):
+        df = pd.DataFrame({'date': pd.date_range('2023-01-01', periods=2), 'actual': [1.0, 100.0]})
+        
+        assert AnomalyDetector.detect_anomalies(df) == []
+
+
+class TestRecommendationEngine:
+    def test_growth_suggests_price_increase(self):
+        historical = np.full(36, 100.0)
+        forecast = np.full(6, 150.0)
+        
+        recommendations = RecommendationEngine.generate_recommendations(forecast, historical)
+        
+        assert [r['id'] for r in recommendations] == ['price_optimize']
+        assert '+50.0%' in recommendations[0]['description']
+    
+    def test_missing_and_zero_actuals_ignored_for_growth(self):
+        historical = np.full(12, 100.0)
+        historical[[3, 7]] = [np.nan, 0.0]
+        forecast = np.full(6, 80.0)
+        
+        recommendations = RecommendationEngine.generate_recommendations(forecast, historical)
+        
+        assert recommendations[0]['id'] == 'promotional_discount'
+        assert '(-20.0%)' in recommendations[0]['description']
+    
+    def test_empty_inputs(self):
+        assert RecommendationEngine.generate_recommendations(np.array([]), np.full(12, 1.0)) == []
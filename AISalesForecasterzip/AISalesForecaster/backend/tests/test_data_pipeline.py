@@ -7,7 +7,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.services.data_pipeline import DataPipeline
+from app.services.data_pipeline import DataPipeline, calendar_fields, compact_dtypes, read_csv_file
 from app.models.schemas import AggregationType
 
 
@@ -106,6 +106,32 @@ class TestDataPipeline:
         assert 'revenue_lag_1' in featured.columns
         assert 'revenue_rolling_mean_7' in featured.columns
     
+    def test_engineer_features_fills_gaps(self):
+        df = create_sample_df(n_rows=40)
+        pipeline = DataPipeline(df)
+        featured = pipeline.engineer_features(df, 'revenue')
+        
+        assert not featured.isna().any().any()
+        # Leading lags are backfilled from the first computed value
+        assert featured['revenue_lag_7'].iloc[0] == df['revenue'].iloc[0]
+        assert featured['revenue_lag_1'].iloc[-1] == df['revenue'].iloc[-2]
+    
+    def test_integer_target_without_price(self):
+        # No price column and an integer target leave every float column already
+        # float64, so the gap fill sees a read-only copy-on-write view
+        dates = pd.date_range(start='2023-01-01', periods=90, freq='D')
+        df = pd.DataFrame({
+            'date': dates,
+            'units_sold': np.arange(90) % 7 + 1,
+            'revenue': np.arange(90) * 10.0
+        })
+        
+        for aggregation in (AggregationType.MONTHLY, AggregationType.DAILY):
+            result = DataPipeline(df).prepare_for_modeling(aggregation=aggregation, target_column='units_sold')
+            
+            assert len(result) > 0
+            assert not result.select_dtypes(include=[np.number]).isna().any().any()
+    
     def test_get_preview(self):
         df = create_sample_df()
         pipeline = DataPipeline(df)
@@ -162,6 +188,82 @@ class TestDataPipelineEdgeCases:
         result = pipeline.validate()
         
         assert any('numeric' in w.lower() for w in result.warnings)
+    
+    def test_caller_frame_untouched(self):
+        df = create_sample_df()
+        df['Date'] = df.pop('date').astype(str)
+        df.loc[3, 'revenue'] = np.nan
+        expected = df.copy()
+        
+        pipeline = DataPipeline(df)
+        pipeline.validate()
+        pipeline.handle_outliers()
+        
+        pd.testing.assert_frame_equal(df, expected)
+
+
+
+class TestCompactDtypes:
+    def test_downcasts_and_categorizes(self):
+        df = create_sample_df()
+        revenue = df['revenue'].copy()
+        compact_dtypes(df)
+        
+        assert df['units_sold'].dtype == np.int8
+        assert df['promotion_flag'].dtype == np.int8
+        assert isinstance(df['region'].dtype, pd.CategoricalDtype)
+        assert df['revenue'].equals(revenue)
+    
+    def test_grouped_modeling_matches_uncompacted(self):
+        df = create_sample_df()
+        expected = DataPipeline(df).prepare_for_modeling(
+            aggregation=AggregationType.MONTHLY, target_column='revenue', group_by='region'
+        )
+        
+        result = DataPipeline(compact_dtypes(df.copy())).prepare_for_modeling(
+            aggregation=AggregationType.MONTHLY, target_column='revenue', group_by='region'
+        )
+        
+        assert len(result) == len(expected)
+        assert result['region'].tolist() == expected['region'].tolist()
+        assert np.allclose(result['revenue'], expected['revenue'])
+
+
+class TestCalendarFields:
+    def test_matches_pandas_accessors(self):
+        dates = pd.Series(pd.date_range(start='1899-12-25', end='2101-01-07', freq='D'))
+        
+        fields = calendar_fields(dates)
+        
+        assert np.array_equal(fields['year'], dates.dt.year)
+        assert np.array_equal(fields['month'], dates.dt.month)
+        assert np.array_equal(fields['day'], dates.dt.day)
+        assert np.array_equal(fields['day_of_week'], dates.dt.dayofweek)
+        assert np.array_equal(fields['week_of_year'], dates.dt.isocalendar().week)
+        assert np.array_equal(fields['quarter'], dates.dt.quarter)
+        assert np.array_equal(fields['is_month_start'], dates.dt.is_month_start)
+        assert np.array_equal(fields['is_month_end'], dates.dt.is_month_end)
+    
+    def test_timezone_aware_uses_local_date(self):
+        dates = pd.Series(pd.date_range(start='2023-12-31 23:00', periods=3, freq='h', tz='America/New_York'))
+        
+        fields = calendar_fields(dates)
+        
+        assert fields['day'].tolist() == [31, 1, 1]
+        assert fields['week_of_year'].tolist() == [52, 1, 1]
+
+
+
+class TestReadCsvFile:
+    def test_missing_values_match_pandas(self, tmp_path):
+        path = tmp_path / 'sales.csv'
+        path.write_text('date,sales,region\n2024-01-01,1,\n2024-01-02,,North\n2024-01-03,3,NA\n')
+        
+        df = read_csv_file(str(path))
+        
+        assert df.isna().sum().to_dict() == pd.read_csv(path).isna().sum().to_dict()
+        assert df['region'].isna().tolist() == [True, False, True]
+        assert DataPipeline(df).validate().missing_values['region'] == 2
 
 
 if __name__ == '__main__':
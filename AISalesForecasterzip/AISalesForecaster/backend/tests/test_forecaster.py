@@ -38,11 +38,23 @@ def create_forecast_ready_df(n_rows=365):
     )
 
 
+# Built and fitted once per module: the TestForecaster tests only read the results
+@pytest.fixture(scope='module')
+def sample_df():
+    return create_forecast_ready_df(n_rows=200)
+
+
+@pytest.fixture(scope='module')
+def prophet_results(sample_df):
+    return Forecaster(sample_df, 'revenue').train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+
+
+@pytest.fixture(scope='module')
+def lightgbm_results(sample_df):
+    return Forecaster(sample_df, 'revenue').train_lightgbm(horizon=3, aggregation=AggregationType.DAILY)
+
+
 class TestForecaster:
-    @pytest.fixture
-    def sample_df(self):
-        return create_forecast_ready_df(n_rows=200)
-    
     def test_forecaster_initialization(self, sample_df):
         forecaster = Forecaster(sample_df, 'revenue')
         
@@ -50,9 +62,8 @@ class TestForecaster:
         assert forecaster.target_column == 'revenue'
         assert forecaster.model is None
     
-    def test_prophet_forecast(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+    def test_prophet_forecast(self, prophet_results):
+        results = prophet_results
         
         assert 'forecast' in results
         assert 'historical' in results
@@ -63,9 +74,8 @@ class TestForecaster:
         assert results['metrics'].rmse > 0
         assert 0 <= results['metrics'].mape <= 100
     
-    def test_lightgbm_forecast(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_lightgbm(horizon=3, aggregation=AggregationType.DAILY)
+    def test_lightgbm_forecast(self, lightgbm_results):
+        results = lightgbm_results
         
         assert 'forecast' in results
         assert 'historical' in results
@@ -85,9 +95,8 @@ class TestForecaster:
         assert prophet_results is not None
         assert len(prophet_results['forecast']) > 0
     
-    def test_forecast_points_structure(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+    def test_forecast_points_structure(self, prophet_results):
+        results = prophet_results
         
         forecast_point = results['forecast'][0]
         assert hasattr(forecast_point, 'date')
@@ -95,17 +104,15 @@ class TestForecaster:
         assert hasattr(forecast_point, 'lower_bound')
         assert hasattr(forecast_point, 'upper_bound')
     
-    def test_historical_points_have_actuals(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+    def test_historical_points_have_actuals(self, prophet_results):
+        results = prophet_results
         
         hist_point = results['historical'][0]
         assert hasattr(hist_point, 'actual')
         assert hist_point.actual is not None
     
-    def test_metrics_calculation(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+    def test_metrics_calculation(self, prophet_results):
+        results = prophet_results
         
         metrics = results['metrics']
         assert metrics.train_size > 0
@@ -113,17 +120,15 @@ class TestForecaster:
         assert metrics.mae >= 0
         assert metrics.rmse >= 0
     
-    def test_decomposition_for_prophet(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_prophet(horizon=3, aggregation=AggregationType.DAILY)
+    def test_decomposition_for_prophet(self, prophet_results):
+        results = prophet_results
         
         assert results['decomposition'] is not None
         assert len(results['decomposition'].trend) > 0
         assert len(results['decomposition'].seasonal) > 0
     
-    def test_feature_importance_for_lightgbm(self, sample_df):
-        forecaster = Forecaster(sample_df, 'revenue')
-        results = forecaster.train_lightgbm(horizon=3, aggregation=AggregationType.DAILY)
+    def test_feature_importance_for_lightgbm(self, lightgbm_results):
+        results = lightgbm_results
         
         assert results['feature_importance'] is not None
         assert len(results['feature_importance']) > 0
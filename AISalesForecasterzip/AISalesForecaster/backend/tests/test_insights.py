@@ -42,20 +42,22 @@ def create_sample_metrics():
     )
 
 
-class TestInsightsGenerator:
-    @pytest.fixture
-    def sample_generator(self):
-        df = create_sample_historical_df()
-        forecast = create_sample_forecast()
-        metrics = create_sample_metrics()
-        
-        return InsightsGenerator(
-            historical_df=df,
-            forecast_data=forecast,
-            metrics=metrics,
-            target_column='revenue'
-        )
+# Shared by the module: the generate_* methods only read the generator
+@pytest.fixture(scope='module')
+def sample_generator():
+    df = create_sample_historical_df()
+    forecast = create_sample_forecast()
+    metrics = create_sample_metrics()
     
+    return InsightsGenerator(
+        historical_df=df,
+        forecast_data=forecast,
+        metrics=metrics,
+        target_column='revenue'
+    )
+
+
+class TestInsightsGenerator:
     def test_generate_title(self, sample_generator):
         title = sample_generator.generate_title()
         